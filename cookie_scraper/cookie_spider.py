@@ -1,26 +1,372 @@
-import json
+import functools
+import itertools
+import logging
 import os
 import time
 import random
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import scrapy
+from scrapy.extensions.httpcache import RFC2616Policy
 from scrapy.http import Request
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.threads import deferToThread
 from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException, ElementNotInteractableException
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException, TimeoutException, NoSuchElementException, ElementNotInteractableException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from webdriver_manager.chrome import ChromeDriverManager
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import tldextract  # For better domain parsing
+import orjson
+import numpy as np
+
+# Number of Chrome instances kept warm and shared across URLs
+POOL_SIZE = 4
+# Recycle a driver after this many pages to keep long runs from bloating Chrome
+MAX_USES_PER_INSTANCE = 50
+# Batches at least this large get their cookie ages computed with NumPy;
+# below it the per-array overhead costs more than the Python loop
+VECTORIZED_AGE_MIN_COOKIES = 32
+# Threads serializing and writing result files in the background
+WRITER_THREADS = 4
+# Buffer size for result files; most pages serialize to less than this
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Where the resolved chromedriver path is remembered between runs
+CHROMEDRIVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'cookie_spider', 'chromedriver_path')
+# How long no new network resources may load before a page counts as settled
+NETWORK_IDLE_SECONDS = 0.5
+
+# Heavy resources that never set cookies we care about, blocked at the network
+# layer. Images and stylesheets still load: tracking pixels are images, and
+# consent dialogs and form visibility depend on CSS
+BLOCKED_URL_PATTERNS = [
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m4v', '*.mov', '*.mp3', '*.m4a', '*.ogg', '*.wav',
+]
+
+# Common tracking cookie names and keywords, in the order categories are checked
+TRACKING_PURPOSE_KEYWORDS = (
+    ('Analytics', ['analytics', 'ga', '_ga', 'gtm', 'pixel', 'stats', 'track', 'visit']),
+    ('Advertising', ['ad', 'ads', 'advert', 'campaign', 'promo', 'promotion', 'marketing']),
+    ('Session/Authentication', ['session', 'sid', 'user', 'auth', 'login', 'account']),
+    ('Preferences/Consent', ['pref', 'setting', 'consent', 'accept', 'agree']),
+    ('Functional', ['func', 'feature', 'ui', 'display', 'layout', 'theme']),
+)
+# One compiled alternation per purpose category, so classifying a cookie
+# name is a single regex scan per category instead of a loop over keywords
+PURPOSE_PATTERNS = tuple(
+    (category, re.compile('|'.join(re.escape(kw) for kw in keywords)))
+    for category, keywords in TRACKING_PURPOSE_KEYWORDS
+)
+# Exact (lowercased) names of well-known tracker cookies, checked when no keyword matched
+NAME_TO_CATEGORY = {
+    '_fbp': 'Facebook Tracking', 'fr': 'Facebook Tracking',
+    '_gid': 'Google Analytics', '_ga': 'Google Analytics', '_gat': 'Google Analytics',
+    '__utma': 'Google Analytics (Legacy)', '__utmb': 'Google Analytics (Legacy)',
+    '__utmc': 'Google Analytics (Legacy)', '__utmz': 'Google Analytics (Legacy)',
+    '_hjid': 'Hotjar Analytics', '_hjsessionuser': 'Hotjar Analytics',
+    '_pin_unauth': 'Pinterest Tracking', '_pinterest_sess': 'Pinterest Tracking',
+    '_twitter_sess': 'Twitter Tracking', 'ct0': 'Twitter Tracking',
+}
+
+
+# Public Suffix List parser built from the snapshot bundled with tldextract:
+# no network fetch or on-disk cache, and the suffix trie stays in memory
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract(domain):
+    """Memoized tldextract lookup; cookie domains repeat heavily within a page"""
+    return _TLD_EXTRACT(domain)
+
+
+# URLs repeat a lot (nav/footer links, each start URL is parsed several times)
+# and ParseResult is an immutable tuple, so parses are safe to share
+_urlparse = functools.lru_cache(maxsize=8192)(urlparse)
+
+
+# Age reported for every session cookie. Shared rather than rebuilt per cookie,
+# so treat it as read-only
+SESSION_AGE_INFO = {
+    'seconds': None,
+    'days': None,
+    'readable': 'Session cookie (expires when browser closes)',
+    'is_session': True
+}
+
+
+# Readable-age units as (upper limit in seconds, seconds per unit, unit name),
+# smallest first; a cookie's age is shown in the first unit whose limit it is under
+AGE_BUCKETS = (
+    (60, 1, 'second'),
+    (3600, 60, 'minute'),
+    (86400, 3600, 'hour'),
+    (30 * 86400, 86400, 'day'),
+    (365 * 86400, 30 * 86400, 'month'),
+    (float('inf'), 365 * 86400, 'year'),
+)
+
+# Unit names for the codes returned by _compute_ages (AGE_EXPIRED has no unit)
+AGE_EXPIRED = 0
+AGE_UNITS = (None,) + tuple(unit for _, _, unit in AGE_BUCKETS)
+_AGE_LIMITS = np.array([limit for limit, _, _ in AGE_BUCKETS], dtype=np.float64)
+_AGE_DIVISORS = np.array([1] + [divisor for _, divisor, _ in AGE_BUCKETS], dtype=np.float64)
+
+
+def _readable_age(age_seconds):
+    """Human-readable form of a positive age in seconds, e.g. '3 days'"""
+    for limit, divisor, unit in AGE_BUCKETS:
+        if age_seconds < limit:
+            amount = age_seconds / divisor
+            return f"{int(amount)} {unit}{'s' if amount != 1 else ''}"
+
+
+def _compute_ages(expiries, now):
+    """Vectorized numeric part of calculate_cookie_age for an array of expiry timestamps
+    
+    Returns (age_seconds, age_days, unit_codes, amounts) arrays, where unit_codes
+    index AGE_UNITS and amounts is the age in that unit
+    """
+    age_seconds = expiries - now
+    age_days = age_seconds / 86400
+    # The first bucket whose limit the age is under, as in _readable_age; codes are shifted by one for AGE_EXPIRED
+    unit_codes = np.where(age_seconds <= 0, AGE_EXPIRED,
+                          np.searchsorted(_AGE_LIMITS, age_seconds, side='right') + 1)
+    amounts = age_seconds / _AGE_DIVISORS[unit_codes]
+    return age_seconds, age_days, unit_codes, amounts
+
+
+# Second-level labels that, under these country TLDs, form part of the public suffix (co.uk, com.au)
+_CC_SECOND_LEVEL = frozenset({'co', 'com', 'org', 'net', 'edu', 'gov'})
+_CC_TLDS = frozenset({'uk', 'au', 'nz', 'jp'})
+
+
+@functools.lru_cache(maxsize=4096)
+def _base_domain(domain):
+    """Heuristic base domain (example.com from www.example.com); the same hosts repeat across links"""
+    if not domain:
+        return ""
+    
+    # Remove port if present
+    domain = domain.partition(':')[0]
+    
+    # Look at no more than the last three labels
+    head, has_dot, tld = domain.rpartition('.')
+    if not has_dot:
+        return domain
+    rest, has_dot, sld = head.rpartition('.')
+    
+    # Handle special cases like co.uk, com.au
+    if has_dot and sld in _CC_SECOND_LEVEL and tld in _CC_TLDS:
+        return f"{rest.rpartition('.')[2]}.{sld}.{tld}"
+    
+    # Return the last two parts for normal domains (example.com)
+    return f"{sld}.{tld}"
+
+
+def _parse_set_cookie(header):
+    """Split a Set-Cookie header into (name, value, flags, kv), or None if it has no name=value"""
+    main_part, _, attribute_part = header.partition(';')
+    name, has_value, value = main_part.strip().partition('=')
+    if not has_value:
+        return None
+    
+    # Attribute names are case-insensitive; valueless flags like Secure go in
+    # a set so the name=value attributes stay plain strings
+    flags = set()
+    kv = {}
+    for part in attribute_part.split(';'):
+        key, has_value, attr_value = part.strip().partition('=')
+        if not key:
+            continue
+        if has_value:
+            kv[key.lower()] = attr_value
+        else:
+            flags.add(key.lower())
+    return name, value, flags, kv
+
+
+def _dumps(value, level):
+    """orjson-indent a value that will sit `level` levels deep in the output"""
+    # orjson escapes newlines inside strings, so every raw newline is layout
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n' + b'  ' * level)
+
+
+def _write_cookie_file(filepath, record):
+    """Write a result record as indented JSON, serializing one entry at a time"""
+    # Top-level lists (cookies) and dicts (web storage) are written entry by
+    # entry, so a large page never needs its whole JSON document in memory.
+    # The bytes are the same as orjson.dumps(record, option=OPT_INDENT_2).
+    # Binary mode skips the text layer, and the large buffer turns the many small
+    # chunk writes into one write syscall for typical files
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(b'{')
+        for i, (key, value) in enumerate(record.items()):
+            f.write(b',\n  ' if i else b'\n  ')
+            f.write(orjson.dumps(key) + b': ')
+            if isinstance(value, (list, dict)) and value:
+                is_dict = isinstance(value, dict)
+                f.write(b'{' if is_dict else b'[')
+                for j, entry in enumerate(value.items() if is_dict else value):
+                    f.write(b',\n    ' if j else b'\n    ')
+                    if is_dict:
+                        f.write(orjson.dumps(entry[0]) + b': ')
+                        entry = entry[1]
+                    f.write(_dumps(entry, 2))
+                f.write(b'\n  }' if is_dict else b'\n  ]')
+            else:
+                f.write(_dumps(value, 1))
+        f.write(b'\n}' if record else b'}')
+
+
+class SetCookieSkippingCachePolicy(RFC2616Policy):
+    """RFC 2616 HTTP cache policy that never stores responses which set cookies
+    
+    A cached response replays its stored Set-Cookie headers on later runs, so
+    stale cookies would be recorded and timestamped as freshly observed ones
+    """
+    
+    def should_cache_response(self, response, request):
+        # Header lookups are case-insensitive
+        if b'Set-Cookie' in response.headers:
+            return False
+        return super().should_cache_response(response, request)
+
+
+class BrowserPool:
+    """Pool of pre-warmed Selenium WebDrivers reused across URLs"""
+
+    def __init__(self, factory, size=POOL_SIZE, max_uses=MAX_USES_PER_INSTANCE, logger=None):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.logger = logger or logging.getLogger(__name__)
+        self._drivers = queue.Queue()
+        self._lock = threading.Lock()
+        self._live = 0
+        
+        # Pre-spawn the drivers so no URL pays the ChromeDriver startup cost
+        for _ in range(size):
+            driver = factory()
+            if driver:
+                self._drivers.put((driver, 0))
+                self._live += 1
+    
+    def __len__(self):
+        return self._live
+    
+    @contextmanager
+    def acquire(self):
+        """Check out a driver for the duration of a with-block"""
+        while True:
+            try:
+                driver, uses = self._drivers.get(timeout=1)
+                break
+            except queue.Empty:
+                # Every driver died and could not be respawned
+                if not self._live:
+                    raise WebDriverException("No WebDriver left in the pool")
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            uses += 1
+            if not healthy or uses >= self.max_uses:
+                reason = 'unhealthy' if not healthy else f'used {uses} times'
+                self.logger.info(f"Recycling WebDriver ({reason})")
+                self._quit(driver)
+                driver, uses = self.factory(), 0
+            if driver:
+                self._drivers.put((driver, uses))
+            else:
+                with self._lock:
+                    self._live -= 1
+    
+    def close(self):
+        """Quit every driver currently in the pool"""
+        while True:
+            try:
+                driver, _ = self._drivers.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+        self._live = 0
+    
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.error(f"Error closing WebDriver: {e}")
+
 
 class CookieSpider(scrapy.Spider):
     name = "cookie_spider"
     
-    def __init__(self, urls=None, headless=False, wait_time=5, interact=True, no_selenium=False, *args, **kwargs):
+    # Element selectors used during page interaction, built once at class load.
+    # Each category is a single compound selector so it costs one find_elements call
+    
+    # Containers whose buttons count as cookie consent buttons regardless of their text
+    CONSENT_BANNER_CSS = "[id*='cookie'], [class*='cookie'], [id*='consent'], [class*='consent']"
+    # Search inputs
+    SEARCH_CSS = ", ".join((
+        "input[type='search']",
+        "input[name*='search']",
+        "input[id*='search']",
+        "input[class*='search']",
+        "form[action*='search'] input[type='text']",
+    ))
+    # Login/signup forms and the fields we fill in them
+    LOGIN_FORM_CSS = ", ".join((
+        "form[action*='login']", "form[action*='signin']", "form[id*='login']", "form[class*='login']",
+        "form[action*='register']", "form[action*='signup']", "form[id*='register']", "form[class*='register']",
+    ))
+    LOGIN_INPUT_CSS = "input[type='text'], input[type='email'], input[type='password']"
+    # Fields filled in general forms
+    GENERAL_INPUT_CSS = ", ".join((
+        "input[type='text']", "input[type='email']", "input[type='tel']",
+        "input[type='number']", "input[type='date']", "textarea",
+    ))
+    # What kind of sample data a field gets, from its type/name/id (and placeholder
+    # for login forms); first matching kind wins, anything else gets plain text
+    LOGIN_FIELD_KINDS = (
+        ('email', re.compile('email', re.I)),
+        ('password', re.compile('password', re.I)),
+    )
+    GENERAL_FIELD_KINDS = (
+        ('email', re.compile('email', re.I)),
+        ('number', re.compile('number', re.I)),
+        ('date', re.compile('date', re.I)),
+    )
+    # Links considered for same-domain navigation
+    LINK_CSS = "a[href]"
+    # Fallback clickable elements, tried in order when no same-domain link was clicked.
+    # CSS cannot match on text, so each selector carries an optional pattern of
+    # element texts to skip, checked in Python
+    INTERACTIVE_SELECTORS = (
+        # Links with href attributes (to check domain)
+        ("a[href]:not([href*='login']):not([href*='signin'])", None),
+        # Buttons that aren't submit buttons or login/sign-in buttons
+        ("button:not([type*='submit'])", re.compile(r"login|Login|sign")),
+        # Divs with button role
+        ("div[role='button']", None),
+        # Elements with button class
+        ("[class*='button']:not([class*='login']):not([class*='signin'])", None),
+    )
+    
+    def __init__(self, urls=None, headless=False, wait_time=5, interact=True, no_selenium=False, pool_size=POOL_SIZE, *args, **kwargs):
         super(CookieSpider, self).__init__(*args, **kwargs)
         # Create cookies directory if it doesn't exist
         self.cookies_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cookies')
@@ -51,10 +397,22 @@ class CookieSpider(scrapy.Spider):
         # Selenium setup
         self.headless = headless
         self.wait_time = int(wait_time)  # Time to wait for JavaScript execution
-        self.driver = None
+        self.pool_size = int(pool_size)  # Number of browsers processing URLs concurrently
+        self.pool = None
+        self.chromedriver_path = None  # Resolved once, then shared by every pooled driver
+        
+        # Result files are serialized and written by background threads so crawling never waits on disk
+        self.writer = ThreadPoolExecutor(max_workers=WRITER_THREADS, thread_name_prefix="cookie-writer")
+        # Pages finish concurrently, so two results for one host can share a
+        # timestamp second; a per-run sequence number keeps their filenames apart
+        self.file_seq = itertools.count(1)
         self.interact = interact  # Whether to interact with forms and inputs
         self.no_selenium = no_selenium
         
+        # Private generator for picking sample values and elements, so this spider
+        # never contends on the module-level random state
+        self.rng = random.Random()
+        
         # Sample data for form filling
         self.sample_data = {
             'text': ['example', 'test123', 'user@example.com', 'John Doe', 'sample text'],
@@ -83,34 +441,90 @@ class CookieSpider(scrapy.Spider):
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--window-size=1920,1080")
             
+            # Turn off browser services that slow startup and make background requests
+            for arg in ("--disable-extensions", "--disable-background-networking", "--disable-default-apps",
+                        "--disable-sync", "--disable-translate", "--metrics-recording-only", "--mute-audio",
+                        "--no-first-run", "--safebrowsing-disable-auto-update",
+                        "--disable-client-side-phishing-detection", "--disable-hang-monitor",
+                        "--disable-prompt-on-repost"):
+                chrome_options.add_argument(arg)
+            
             # Set user agent
             chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36")
             
             # Enable cookies
             chrome_options.add_argument("--enable-cookies")
-            # Enable third-party cookies (disable privacy restrictions)
-            chrome_options.add_argument("--disable-features=BlockThirdPartyCookies")
-            
-            # Optional: Disable same-site cookie restrictions
-            chrome_options.add_argument("--disable-features=SameSiteByDefaultCookies")
+            # Enable third-party cookies (disable privacy restrictions), disable
+            # same-site cookie restrictions and the translate bar. Chrome only
+            # honours the last --disable-features switch, so list them all in one
+            chrome_options.add_argument("--disable-features=BlockThirdPartyCookies,SameSiteByDefaultCookies,TranslateUI")
             
             # Initialize the WebDriver
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                driver = webdriver.Chrome(service=Service(self.get_chromedriver_path()), options=chrome_options)
+            except SessionNotCreatedException as e:
+                # Most likely Chrome was updated past a remembered driver, so fetch a matching one
+                if os.environ.get("CHROMEDRIVER_PATH"):
+                    raise
+                self.logger.warning(f"Cached chromedriver failed to start, reinstalling: {e}")
+                self.chromedriver_path = self.get_chromedriver_path(refresh=True)
+                driver = webdriver.Chrome(service=Service(self.chromedriver_path), options=chrome_options)
             
             # Set page load timeout
             driver.set_page_load_timeout(30)
             
+            self.block_heavy_resources(driver)
+            
             return driver
         except Exception as e:
             self.logger.error(f"Error setting up Selenium: {e}")
             return None
     
+    def block_heavy_resources(self, driver):
+        """Skip downloading fonts and media, which only slow down page loads
+        
+        Network domain state belongs to a tab, so this is sent again for every new tab
+        """
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    
+    def get_chromedriver_path(self, refresh=False):
+        """Find chromedriver without re-running ChromeDriverManager on every launch"""
+        # An explicit path always wins
+        env_path = os.environ.get("CHROMEDRIVER_PATH")
+        if env_path:
+            return env_path
+        
+        if self.chromedriver_path and not refresh:
+            return self.chromedriver_path
+        
+        # Reuse the driver resolved by a previous run if it is still on disk
+        if not refresh:
+            try:
+                with open(CHROMEDRIVER_CACHE_FILE) as f:
+                    cached_path = f.read().strip()
+                if cached_path and os.access(cached_path, os.X_OK):
+                    self.chromedriver_path = cached_path
+                    return cached_path
+            except OSError:
+                pass
+        
+        # Download/validate a driver and remember where it lives
+        self.chromedriver_path = ChromeDriverManager().install()
+        try:
+            os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+            with open(CHROMEDRIVER_CACHE_FILE, 'w') as f:
+                f.write(self.chromedriver_path)
+        except OSError as e:
+            self.logger.debug(f"Could not cache chromedriver path: {e}")
+        return self.chromedriver_path
+    
     def start_requests(self):
-        # Initialize Selenium WebDriver
+        # Initialize the pool of Selenium WebDrivers
         if not self.no_selenium:
-            self.driver = self.setup_selenium()
-        if not self.driver:
+            self.pool = BrowserPool(self.setup_selenium, size=self.pool_size, logger=self.logger)
+            self.logger.info(f"Started {len(self.pool)} Selenium WebDriver(s)")
+        if not self.pool:
             self.logger.error("Failed to initialize Selenium WebDriver. Falling back to regular Scrapy requests.")
             for url in self.start_urls:
                 # Include error status codes in the allowed list and allow redirects
@@ -138,32 +552,41 @@ class CookieSpider(scrapy.Spider):
                 )
     
     def closed(self, reason):
-        # Clean up Selenium WebDriver when spider closes
-        if self.driver:
-            self.logger.info("Closing Selenium WebDriver")
-            try:
-                self.driver.quit()
-            except Exception as e:
-                self.logger.error(f"Error closing WebDriver: {e}")
+        # Clean up Selenium WebDrivers when spider closes
+        if self.pool:
+            self.logger.info("Closing Selenium WebDrivers")
+            self.pool.close()
+        
+        # Let the writers finish every queued file before the process exits
+        self.writer.shutdown(wait=True)
     
-    def handle_error(self, failure):
+    def result_filepath(self, domain, saved_at):
+        """Unique path for a domain's result file saved at the given time"""
+        filename = f"{domain.replace('.', '_')}_{saved_at:%Y%m%d_%H%M%S}_{next(self.file_seq)}.json"
+        return os.path.join(self.cookies_dir, filename)
+    
+    def write_result(self, filepath, record):
+        """Write one result file on a writer thread, logging the outcome"""
+        try:
+            _write_cookie_file(filepath, record)
+            self.logger.info(f"Saved data to {filepath}")
+        except Exception as e:
+            self.logger.error(f"Error writing {filepath}: {e}")
+    
+    async def handle_error(self, failure):
         """Handle request errors"""
         request = failure.request
         url = request.url
-        domain = urlparse(url).netloc
+        domain = _urlparse(url).netloc
         
         self.logger.error(f"Error processing {url}: {repr(failure)}")
         
         # Try to use Selenium as a fallback for failed requests
-        if self.driver and 'selenium' not in request.meta:
+        if self.pool and 'selenium' not in request.meta:
             self.logger.info(f"Attempting to use Selenium as fallback for {url}")
             try:
-                # Navigate directly with Selenium
-                self.driver.get(url)
-                time.sleep(self.wait_time)
-                
-                # Process with selenium method directly
-                return self.process_selenium_page(url, domain)
+                # Retry off the reactor thread so the crawl keeps going meanwhile
+                return await maybe_deferred_to_future(deferToThread(self.process_with_pool, url, domain))
             except Exception as e:
                 self.logger.error(f"Selenium fallback also failed for {url}: {e}")
         
@@ -176,10 +599,15 @@ class CookieSpider(scrapy.Spider):
             'file_saved': None
         }
     
-    def parse_with_selenium(self, response):
+    def process_with_pool(self, url, domain):
+        """Process a page on whichever pooled driver is free (runs in a worker thread)"""
+        with self.pool.acquire() as driver:
+            return self.process_selenium_page(driver, url, domain)
+    
+    async def parse_with_selenium(self, response):
         """Parse using Selenium to capture JavaScript-set cookies"""
         url = response.url
-        domain = urlparse(url).netloc
+        domain = _urlparse(url).netloc
         
         # Handle error status codes
         if response.status in [400, 403, 404, 500]:
@@ -188,7 +616,8 @@ class CookieSpider(scrapy.Spider):
         self.logger.info(f"Processing {url} with Selenium")
         
         try:
-            return self.process_selenium_page(url, domain)
+            # Drive the browser in a thread so other URLs are processed concurrently
+            return await maybe_deferred_to_future(deferToThread(self.process_with_pool, url, domain))
         except WebDriverException as e:
             self.logger.error(f"Selenium error for {url}: {e}")
             # Fall back to non-Selenium parsing
@@ -203,12 +632,13 @@ class CookieSpider(scrapy.Spider):
                 'file_saved': None
             }
             
-    def is_third_party_cookie(self, cookie_domain, page_domain):
+    def is_third_party_cookie(self, cookie_domain, page_domain, page_extract=None):
         """Determine if a cookie is from a third-party domain
         
         Args:
             cookie_domain (str): The domain of the cookie
             page_domain (str): The domain of the page being visited
+            page_extract: Precomputed tldextract result for page_domain, if available
             
         Returns:
             bool: True if the cookie is from a third-party domain, False otherwise
@@ -218,13 +648,13 @@ class CookieSpider(scrapy.Spider):
             return False, "No cookie domain"
             
         # Remove leading dot if present
-        if cookie_domain.startswith('.'):
-            cookie_domain = cookie_domain[1:]
+        cookie_domain = cookie_domain[1:] if cookie_domain[:1] == '.' else cookie_domain
             
         # Extract domains using tldextract for more accurate comparison
         try:
-            page_extract = tldextract.extract(page_domain)
-            cookie_extract = tldextract.extract(cookie_domain)
+            if page_extract is None:
+                page_extract = _extract(page_domain)
+            cookie_extract = _extract(cookie_domain)
             
             page_registered_domain = f"{page_extract.domain}.{page_extract.suffix}"
             cookie_registered_domain = f"{cookie_extract.domain}.{cookie_extract.suffix}"
@@ -249,99 +679,102 @@ class CookieSpider(scrapy.Spider):
         Returns:
             str: The likely purpose of the cookie
         """
-        # Common tracking cookie names and keywords
-        analytics_keywords = ['analytics', 'ga', '_ga', 'gtm', 'pixel', 'stats', 'track', 'visit']
-        ad_keywords = ['ad', 'ads', 'advert', 'campaign', 'promo', 'promotion', 'marketing']
-        session_keywords = ['session', 'sid', 'user', 'auth', 'login', 'account']
-        preference_keywords = ['pref', 'setting', 'consent', 'accept', 'agree']
-        functional_keywords = ['func', 'feature', 'ui', 'display', 'layout', 'theme']
-        
         name_lower = cookie_name.lower()
         
         # Check for common tracking services
-        if any(kw in name_lower for kw in analytics_keywords):
-            return 'Analytics'
-        elif any(kw in name_lower for kw in ad_keywords):
-            return 'Advertising'
-        elif any(kw in name_lower for kw in session_keywords):
-            return 'Session/Authentication'
-        elif any(kw in name_lower for kw in preference_keywords):
-            return 'Preferences/Consent'
-        elif any(kw in name_lower for kw in functional_keywords):
-            return 'Functional'
-        
-        # Check for specific known trackers
-        if name_lower in ['_fbp', 'fr']:
-            return 'Facebook Tracking'
-        elif name_lower in ['_gid', '_ga', '_gat']:
-            return 'Google Analytics'
-        elif name_lower in ['__utma', '__utmb', '__utmc', '__utmz']:
-            return 'Google Analytics (Legacy)'
-        elif name_lower in ['_hjid', '_hjSessionUser']:
-            return 'Hotjar Analytics'
-        elif name_lower in ['_pin_unauth', '_pinterest_sess']:
-            return 'Pinterest Tracking'
-        elif name_lower in ['_twitter_sess', 'ct0']:
-            return 'Twitter Tracking'
-        
-        # Default if no match
-        return 'Unknown'
-    
-    def process_selenium_page(self, url, domain):
+        for category, pattern in PURPOSE_PATTERNS:
+            if pattern.search(name_lower):
+                return category
+        
+        # Check for specific known trackers, defaulting to Unknown
+        return NAME_TO_CATEGORY.get(name_lower, 'Unknown')
+    
+    def reset_tab(self, driver):
+        """Move the driver to a new, empty tab and close every other window"""
+        driver.switch_to.new_window('tab')
+        new_tab = driver.current_window_handle
+        for handle in driver.window_handles:
+            if handle != new_tab:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(new_tab)
+        # The old tab's resource blocking doesn't carry over to the new one
+        self.block_heavy_resources(driver)
+    
+    def process_selenium_page(self, driver, url, domain):
         """Process a page with Selenium to extract cookies and storage data"""
         try:
+            # Pooled drivers are reused across URLs, so reset what an earlier page
+            # could leave behind: the page gets a new tab (sessionStorage belongs to
+            # the tab) with font/media blocking set up again for it, the cookie jar
+            # the CDP dump below reads is emptied, and the target origin's
+            # localStorage, IndexedDB, WebSQL, caches and service workers are
+            # cleared. Storage of other origins (redirect targets, pages reached by
+            # interaction, third-party frames) is not cleared, so it can carry over
+            # between pages on the same driver
+            self.reset_tab(driver)
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            parsed_target = _urlparse(url)
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": f"{parsed_target.scheme}://{parsed_target.netloc}",
+                "storageTypes": "local_storage,indexeddb,websql,cache_storage,service_workers",
+            })
+            
             # Navigate to the URL
-            self.driver.get(url)
+            driver.get(url)
             
             # Wait for JavaScript to execute and set initial cookies
-            self.logger.info(f"Waiting {self.wait_time} seconds for JavaScript execution")
-            time.sleep(self.wait_time)
-            
-            # Get initial cookies from Selenium
-            initial_cookies = self.driver.get_cookies()
-            self.logger.info(f"Found {len(initial_cookies)} initial cookies with Selenium for {domain}")
+            self.logger.info(f"Waiting up to {self.wait_time} seconds for JavaScript execution")
+            self.wait_for_page_settled(driver)
             
             # Interact with the page if enabled
             if self.interact:
-                self.interact_with_page(domain)
+                self.interact_with_page(driver, domain)
             
-            # Get all cookies from Selenium after interaction
-            selenium_cookies = self.driver.get_cookies()
+            # Get all cookies after interaction. Unlike get_cookies(), which only sees
+            # the current document's cookies, CDP returns every cookie in the jar,
+            # including HTTP-only and third-party cookies set by embedded frames
+            selenium_cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
             self.logger.info(f"Found {len(selenium_cookies)} cookies after interaction for {domain}")
             
             # Extract the main domain for third-party cookie detection
-            parsed_url = urlparse(url)
+            parsed_url = _urlparse(url)
             main_domain = parsed_url.netloc
+            # The page side is the same for every cookie, so extract it once
+            page_extract = _extract(main_domain)
             
             # Process cookies
             cookie_data = []
             third_party_cookies = []
+            expiry_timestamps = []
             current_time = time.time()
             
             for cookie in selenium_cookies:
-                # Get expiry timestamp
-                expiry = cookie.get('expiry')
+                # name/value/domain/path are always present in the CDP cookie schema
+                name = cookie['name']
+                value = cookie['value']
+                cookie_domain = cookie['domain']
                 
-                # Calculate cookie age in seconds, days, and human-readable format
-                age_info = self.calculate_cookie_age(expiry, current_time)
+                # Get expiry timestamp (CDP reports session cookies with expires -1)
+                expiry = None if cookie.get('session') else cookie.get('expires')
+                expiry_timestamps.append(expiry)
                 
                 # Check if this is a third-party cookie
-                cookie_domain = cookie.get('domain', '')
-                is_third_party, domain_info = self.is_third_party_cookie(cookie_domain, main_domain)
+                is_third_party, domain_info = self.is_third_party_cookie(cookie_domain, main_domain, page_extract)
                 
                 # Identify tracking purpose
-                tracking_purpose = self.identify_tracking_purpose(cookie.get('name', ''), cookie.get('value', ''))
+                tracking_purpose = self.identify_tracking_purpose(name, value)
                 
                 cookie_info = {
-                    'name': cookie.get('name', ''),
-                    'value': cookie.get('value', ''),
+                    'name': name,
+                    'value': value,
                     'domain': cookie_domain,
-                    'path': cookie.get('path', '/'),
-                    'expires': cookie.get('expiry', ''),
-                    'secure': cookie.get('secure', False),
-                    'httponly': cookie.get('httpOnly', False),
+                    'path': cookie['path'],
+                    'expires': expiry if expiry is not None else '',
+                    'secure': cookie['secure'],
+                    'httponly': cookie['httpOnly'],
                     'samesite': cookie.get('sameSite', ''),
-                    'age': age_info,
+                    'age': None,  # Filled in below for the whole page at once
                     'is_third_party': is_third_party,
                     'domain_info': domain_info,
                     'tracking_purpose': tracking_purpose
@@ -352,47 +785,56 @@ class CookieSpider(scrapy.Spider):
                 # Collect third-party cookies separately for reporting
                 if is_third_party:
                     third_party_cookies.append(cookie_info)
-                    self.logger.info(f"Third-party cookie detected: {cookie.get('name', '')} from {cookie_domain} (Purpose: {tracking_purpose})")
-                
-            # Get localStorage data
-            try:
-                local_storage = self.driver.execute_script("""
-                    var items = {};
-                    for (var i = 0, len = localStorage.length; i < len; i++) {
-                        var key = localStorage.key(i);
-                        items[key] = localStorage.getItem(key);
-                    }
-                    return items;
-                """)
-                self.logger.info(f"Found {len(local_storage)} localStorage items for {domain}")
-            except Exception as e:
-                self.logger.error(f"Error getting localStorage: {e}")
-                local_storage = {}
+                    self.logger.info(f"Third-party cookie detected: {name} from {cookie_domain} (Purpose: {tracking_purpose})")
+            
+            # Calculate cookie ages in seconds, days, and human-readable format
+            for cookie_info, age_info in zip(cookie_data, self.calculate_cookie_ages(expiry_timestamps, current_time)):
+                cookie_info['age'] = age_info
                 
-            # Get sessionStorage data
+            # Get localStorage and sessionStorage data in a single round trip
             try:
-                session_storage = self.driver.execute_script("""
-                    var items = {};
-                    for (var i = 0, len = sessionStorage.length; i < len; i++) {
-                        var key = sessionStorage.key(i);
-                        items[key] = sessionStorage.getItem(key);
+                storage = driver.execute_script("""
+                    function dump(name) {
+                        try {
+                            var store = window[name];
+                            var items = {};
+                            for (var i = 0, len = store.length; i < len; i++) {
+                                var key = store.key(i);
+                                items[key] = store.getItem(key);
+                            }
+                            return {items: items};
+                        } catch (e) {
+                            return {error: String(e)};
+                        }
                     }
-                    return items;
+                    return {localStorage: dump('localStorage'), sessionStorage: dump('sessionStorage')};
                 """)
-                self.logger.info(f"Found {len(session_storage)} sessionStorage items for {domain}")
             except Exception as e:
-                self.logger.error(f"Error getting sessionStorage: {e}")
-                session_storage = {}
+                self.logger.error(f"Error getting web storage: {e}")
+                storage = {}
+            
+            # Each store comes back as either {'items': {...}} or {'error': ...}
+            storage_items = {}
+            for name in ('localStorage', 'sessionStorage'):
+                result = storage.get(name) or {}
+                if 'error' in result:
+                    self.logger.error(f"Error getting {name}: {result['error']}")
+                    storage_items[name] = {}
+                else:
+                    storage_items[name] = result.get('items') or {}
+                    self.logger.info(f"Found {len(storage_items[name])} {name} items for {domain}")
+            local_storage = storage_items['localStorage']
+            session_storage = storage_items['sessionStorage']
             
             # Save cookies and storage data to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{domain.replace('.', '_')}_{timestamp}.json"
-            filepath = os.path.join(self.cookies_dir, filename)
+            # One clock read for both the filename and the saved timestamp
+            saved_at = datetime.now()
+            filepath = self.result_filepath(domain, saved_at)
             
             # Prepare data to save
             data_to_save = {
                 'url': url,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': saved_at,
                 'cookies': cookie_data,
                 'localStorage': local_storage,
                 'sessionStorage': session_storage,
@@ -401,13 +843,11 @@ class CookieSpider(scrapy.Spider):
                 'third_party_count': len(third_party_cookies)
             }
             
-            with open(filepath, 'w') as f:
-                json.dump(data_to_save, f, indent=4)
+            self.writer.submit(self.write_result, filepath, data_to_save)
             
             # Calculate total items for reporting
             total_items = len(cookie_data) + len(local_storage) + len(session_storage)
             
-            self.logger.info(f"Saved data to {filepath}")
             return {
                 'domain': domain,
                 'url': url,
@@ -419,10 +859,9 @@ class CookieSpider(scrapy.Spider):
                 'source': 'selenium'
             }
                 
-        except WebDriverException as e:
-            self.logger.error(f"Selenium error for {url}: {e}")
-            # Fall back to non-Selenium parsing
-            return Request(url=url, callback=self.parse_without_selenium, meta={'dont_redirect': True, 'handle_httpstatus_list': [302, 301]})
+        except WebDriverException:
+            # Let the pool recycle the driver; the caller falls back to non-Selenium parsing
+            raise
         except Exception as e:
             self.logger.error(f"Unexpected error for {url}: {e}")
             return {
@@ -433,232 +872,300 @@ class CookieSpider(scrapy.Spider):
                 'file_saved': None
             }
     
-    def interact_with_page(self, domain):
+    def wait_for_page_settled(self, driver, timeout=None):
+        """Wait until the document has loaded and network activity has died down
+        
+        Returns as soon as the page is quiet rather than always sleeping, but
+        never waits longer than timeout (defaults to wait_time) seconds.
+        """
+        timeout = self.wait_time if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            self.logger.debug(f"Page did not finish loading within {timeout} seconds")
+            return
+        
+        # Resource Timing entries are added as requests finish, so the network
+        # counts as idle once the entry count stops growing for a while
+        last_count = -1
+        quiet_since = time.monotonic()
+        while time.monotonic() < deadline:
+            count = driver.execute_script(
+                "performance.setResourceTimingBufferSize(100000);"
+                "return performance.getEntriesByType('resource').length;"
+            )
+            now = time.monotonic()
+            if count != last_count:
+                last_count, quiet_since = count, now
+            elif now - quiet_since >= NETWORK_IDLE_SECONDS:
+                return
+            time.sleep(0.1)
+    
+    def interact_with_page(self, driver, domain):
         """Find and interact with forms, inputs, and buttons on the page"""
         self.logger.info(f"Attempting to interact with elements on {domain}")
         
         try:
             # 1. Try to handle cookie consent dialogs first
-            self.handle_cookie_consent()
+            self.handle_cookie_consent(driver)
             
             # 2. Find and interact with search forms
-            if self.interact_with_search_forms():
+            if self.interact_with_search_forms(driver):
                 self.logger.info(f"Successfully interacted with search form on {domain}")
             
             # 3. Find and interact with login/signup forms
-            elif self.interact_with_login_forms():
+            elif self.interact_with_login_forms(driver):
                 self.logger.info(f"Successfully interacted with login/signup form on {domain}")
             
             # 4. Find and interact with general forms
-            elif self.interact_with_general_forms():
+            elif self.interact_with_general_forms(driver):
                 self.logger.info(f"Successfully interacted with general form on {domain}")
             
             # 5. Click on buttons/links to navigate deeper (passing domain to ensure same-domain clicks)
-            elif self.click_interactive_elements(domain):
+            elif self.click_interactive_elements(driver, domain):
                 self.logger.info(f"Successfully clicked on interactive elements on {domain}")
             
             else:
                 self.logger.info(f"No interactive elements found or interaction failed on {domain}")
             
             # Wait for any resulting page changes and cookie updates
-            time.sleep(self.wait_time)
+            self.wait_for_page_settled(driver)
             
         except Exception as e:
             self.logger.error(f"Error during page interaction on {domain}: {e}")
     
-    def handle_cookie_consent(self):
+    def handle_cookie_consent(self, driver):
         """Attempt to accept cookie consent dialogs"""
-        # Common cookie consent button selectors
-        consent_selectors = [
-            "//button[contains(., 'Accept') or contains(., 'accept') or contains(., 'Allow') or contains(., 'allow')]" ,
-            "//button[contains(., 'Agree') or contains(., 'agree') or contains(., 'Consent') or contains(., 'consent')]",
-            "//a[contains(., 'Accept') or contains(., 'accept') or contains(., 'Allow') or contains(., 'allow')]",
-            "//*[contains(@id, 'cookie') or contains(@class, 'cookie')]//button",
-            "//*[contains(@id, 'consent') or contains(@class, 'consent')]//button",
-            "//button[contains(@id, 'accept') or contains(@id, 'agree')]"
-        ]
-        
-        for selector in consent_selectors:
-            try:
-                buttons = self.driver.find_elements(By.XPATH, selector)
-                for button in buttons:
-                    if button.is_displayed() and button.is_enabled():
-                        self.logger.info(f"Clicking cookie consent button: {button.text or 'unnamed button'}")
-                        button.click()
-                        time.sleep(1)  # Brief pause after clicking
-                        return True
-            except Exception as e:
-                self.logger.debug(f"Error with cookie consent selector {selector}: {e}")
+        try:
+            # Scan buttons and links inside the page in one script, instead of matching
+            # XPaths in chromedriver. Rules are ranked by how likely they are to be the
+            # accept button: accept/allow buttons, agree/consent buttons, accept/allow
+            # links, any button inside a cookie/consent banner, then accept/agree ids.
+            # The best-ranked visible match wins (ties go to DOM order), so a banner's
+            # "Reject all" or close button is only clicked when nothing says accept
+            match = driver.execute_script("""
+                function visible(el) {
+                    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+                }
+                function rank(el, banner) {
+                    var text = el.textContent || '';
+                    if (el.tagName === 'A') {
+                        return /accept|allow/i.test(text) ? 2 : -1;
+                    }
+                    if (/accept|allow/i.test(text)) return 0;
+                    if (/agree|consent/i.test(text)) return 1;
+                    if (el.parentElement && el.parentElement.closest(banner)) return 3;
+                    if (/accept|agree/.test(el.id)) return 4;
+                    return -1;
+                }
+                var banner = arguments[0];
+                var candidates = document.querySelectorAll('button, a');
+                var best = null, bestRank = Infinity;
+                for (var i = 0; i < candidates.length && bestRank > 0; i++) {
+                    var el = candidates[i];
+                    var r = rank(el, banner);
+                    if (r >= 0 && r < bestRank && !el.disabled && visible(el)) {
+                        best = el;
+                        bestRank = r;
+                    }
+                }
+                return best && [best, (best.innerText || '').trim()];
+            """, self.CONSENT_BANNER_CSS)
+            if match:
+                button, label = match
+                self.logger.info(f"Clicking cookie consent button: {label or 'unnamed button'}")
+                button.click()
+                # Brief wait for the dialog to go away (also covers the button being removed)
+                try:
+                    WebDriverWait(driver, 1).until(EC.invisibility_of_element(button))
+                except TimeoutException:
+                    pass
+                return True
+        except Exception as e:
+            self.logger.debug(f"Error handling cookie consent: {e}")
         
         return False
     
-    def interact_with_search_forms(self):
+    def interact_with_search_forms(self, driver):
         """Find and interact with search forms"""
-        # Try to find search inputs
-        search_selectors = [
-            "//input[@type='search']",
-            "//input[contains(@name, 'search') or contains(@id, 'search') or contains(@class, 'search')]",
-            "//form[contains(@action, 'search')]//input[@type='text']"
-        ]
-        
-        for selector in search_selectors:
-            try:
-                search_inputs = self.driver.find_elements(By.XPATH, selector)
-                for search_input in search_inputs:
-                    if search_input.is_displayed() and search_input.is_enabled():
-                        # Clear any existing text
-                        search_input.clear()
-                        
-                        # Enter search query
-                        search_term = random.choice(self.sample_data['search'])
-                        self.logger.info(f"Entering search term '{search_term}' in search input")
-                        search_input.send_keys(search_term)
-                        
-                        # Try to submit the form
-                        try:
-                            # First try pressing Enter
-                            search_input.send_keys(Keys.ENTER)
-                            time.sleep(2)  # Wait for results
-                            
-                            # If that didn't work, look for a submit button
-                            form = search_input.find_element(By.XPATH, "./ancestor::form")
-                            submit_button = form.find_element(By.XPATH, ".//button[@type='submit'] | .//input[@type='submit']")
-                            submit_button.click()
-                            
-                        except Exception as e:
-                            self.logger.debug(f"Error submitting search form: {e}")
-                        
-                        return True
-            except Exception as e:
-                self.logger.debug(f"Error with search selector {selector}: {e}")
+        try:
+            # Find the first visible, enabled search input in one in-page scan
+            search_input = driver.execute_script("""
+                var inputs = document.querySelectorAll(arguments[0]);
+                for (var i = 0; i < inputs.length; i++) {
+                    var el = inputs[i];
+                    if (!el.disabled && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)) {
+                        return el;
+                    }
+                }
+                return null;
+            """, self.SEARCH_CSS)
+            if search_input:
+                # Clear any existing text
+                search_input.clear()
+                
+                # Enter search query
+                search_term = self.rng.choice(self.sample_data['search'])
+                self.logger.info(f"Entering search term '{search_term}' in search input")
+                search_input.send_keys(search_term)
+                
+                # Try to submit the form
+                try:
+                    # First try pressing Enter
+                    search_input.send_keys(Keys.ENTER)
+                    self.wait_for_page_settled(driver, timeout=2)  # Wait for results
+                    
+                    # If that didn't work, look for a submit button
+                    form = search_input.find_element(By.XPATH, "./ancestor::form")
+                    submit_button = form.find_element(By.XPATH, ".//button[@type='submit'] | .//input[@type='submit']")
+                    submit_button.click()
+                    
+                except Exception as e:
+                    self.logger.debug(f"Error submitting search form: {e}")
+                
+                return True
+        except Exception as e:
+            self.logger.debug(f"Error with search inputs: {e}")
         
         return False
     
-    def interact_with_login_forms(self):
+    def collect_form_fields(self, driver, form_selector, field_selector):
+        """Fetch visible forms with their fillable fields and selects in one round trip"""
+        # Each form comes back with its fillable elements plus the attributes we
+        # match on, so no per-field get_attribute/is_displayed calls are needed
+        return driver.execute_script("""
+            function visible(el) {
+                return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+            }
+            function attr(el, name) {
+                return el.getAttribute(name) || '';
+            }
+            var formSelector = arguments[0], fieldSelector = arguments[1];
+            var forms = [];
+            document.querySelectorAll(formSelector).forEach(function (form) {
+                if (!visible(form)) {
+                    return;
+                }
+                // form.action can be shadowed by an input named "action"
+                var action = typeof form.action === 'string' ? form.action : attr(form, 'action');
+                var fields = [];
+                form.querySelectorAll(fieldSelector).forEach(function (field) {
+                    if (visible(field) && !field.disabled) {
+                        fields.push({element: field, type: field.type || '', name: attr(field, 'name'),
+                                     id: attr(field, 'id'), placeholder: attr(field, 'placeholder')});
+                    }
+                });
+                var selects = [];
+                form.querySelectorAll('select').forEach(function (select) {
+                    if (visible(select) && !select.disabled) {
+                        selects.push({element: select, option_count: select.options.length});
+                    }
+                });
+                forms.push({id: attr(form, 'id'), class: attr(form, 'class'), action: action,
+                            fields: fields, selects: selects});
+            });
+            return forms;
+        """, form_selector, field_selector) or []
+    
+    def fill_form_fields(self, driver, fill_values, select_indexes=()):
+        """Set field values and pick select options in one round trip, firing the usual events"""
+        # Uses the native value setter so framework-controlled inputs (React etc.)
+        # see the change, then dispatches input/change like real typing would
+        driver.execute_script("""
+            function fire(el) {
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+            arguments[0].forEach(function (pair) {
+                var el = pair[0];
+                var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+                el.focus();
+                setter.call(el, pair[1]);
+                fire(el);
+            });
+            arguments[1].forEach(function (pair) {
+                pair[0].selectedIndex = pair[1];
+                fire(pair[0]);
+            });
+        """, fill_values, list(select_indexes))
+    
+    def classify_field(self, field_text, kinds):
+        """Return the sample-data kind for a field, falling back to plain text"""
+        for kind, pattern in kinds:
+            if pattern.search(field_text):
+                return kind
+        return 'text'
+    
+    def interact_with_login_forms(self, driver):
         """Find and interact with login/signup forms"""
-        # Try to find login/signup forms
-        login_selectors = [
-            "//form[contains(@action, 'login') or contains(@action, 'signin') or contains(@id, 'login') or contains(@class, 'login')]",
-            "//form[contains(@action, 'register') or contains(@action, 'signup') or contains(@id, 'register') or contains(@class, 'register')]"
-        ]
-        
-        for selector in login_selectors:
-            try:
-                forms = self.driver.find_elements(By.XPATH, selector)
-                for form in forms:
-                    if not form.is_displayed():
-                        continue
+        try:
+            # Try to find login/signup forms
+            forms = self.collect_form_fields(driver, self.LOGIN_FORM_CSS, self.LOGIN_INPUT_CSS)
+            for form in forms:
+                fill_values = []
+                
+                for field in form['fields']:
+                    input_type = field['type']
                     
-                    # Find input fields in the form
-                    inputs = form.find_elements(By.XPATH, ".//input[@type='text' or @type='email' or @type='password']")
+                    # Determine what kind of data to enter
+                    kind = self.classify_field(
+                        f"{input_type}|{field['name']}|{field['id']}|{field['placeholder']}", self.LOGIN_FIELD_KINDS)
+                    value = self.rng.choice(self.sample_data[kind])
                     
-                    if len(inputs) >= 1:
-                        filled_inputs = 0
-                        
-                        for input_field in inputs:
-                            if not (input_field.is_displayed() and input_field.is_enabled()):
-                                continue
-                                
-                            input_type = input_field.get_attribute('type')
-                            input_name = input_field.get_attribute('name') or ''
-                            input_id = input_field.get_attribute('id') or ''
-                            input_placeholder = input_field.get_attribute('placeholder') or ''
-                            
-                            # Clear any existing text
-                            input_field.clear()
-                            
-                            # Determine what kind of data to enter
-                            if input_type == 'email' or 'email' in input_name.lower() or 'email' in input_id.lower() or 'email' in input_placeholder.lower():
-                                value = random.choice(self.sample_data['email'])
-                            elif input_type == 'password' or 'password' in input_name.lower() or 'password' in input_id.lower() or 'password' in input_placeholder.lower():
-                                value = random.choice(self.sample_data['password'])
-                            else:
-                                value = random.choice(self.sample_data['text'])
-                            
-                            self.logger.info(f"Entering '{value}' in {input_type} field")
-                            input_field.send_keys(value)
-                            filled_inputs += 1
-                        
-                        if filled_inputs > 0:
-                            # Don't actually submit login forms to avoid account lockouts
-                            # Just fill in the fields to trigger any JavaScript events
-                            self.logger.info(f"Filled {filled_inputs} fields in login/signup form but not submitting")
-                            return True
-            except Exception as e:
-                self.logger.debug(f"Error with login form selector {selector}: {e}")
+                    self.logger.info(f"Entering '{value}' in {input_type} field")
+                    fill_values.append([field['element'], value])
+                
+                if fill_values:
+                    self.fill_form_fields(driver, fill_values)
+                    # Don't actually submit login forms to avoid account lockouts
+                    # Just fill in the fields to trigger any JavaScript events
+                    self.logger.info(f"Filled {len(fill_values)} fields in login/signup form but not submitting")
+                    return True
+        except Exception as e:
+            self.logger.debug(f"Error with login forms: {e}")
         
         return False
     
-    def interact_with_general_forms(self):
+    def interact_with_general_forms(self, driver):
         """Find and interact with general forms"""
         try:
             # Find all forms that are not search or login forms
-            forms = self.driver.find_elements(By.XPATH, "//form")
+            forms = self.collect_form_fields(driver, "form", self.GENERAL_INPUT_CSS)
             
             for form in forms:
-                if not form.is_displayed():
-                    continue
-                
                 # Skip search and login forms as we've already tried those
-                form_id = form.get_attribute('id') or ''
-                form_class = form.get_attribute('class') or ''
-                form_action = form.get_attribute('action') or ''
-                
-                if ('search' in form_id.lower() or 'search' in form_class.lower() or 'search' in form_action.lower() or
-                    'login' in form_id.lower() or 'login' in form_class.lower() or 'login' in form_action.lower() or
-                    'signin' in form_id.lower() or 'signin' in form_class.lower() or 'signin' in form_action.lower()):
+                form_attrs = ' '.join((form['id'], form['class'], form['action'])).lower()
+                if 'search' in form_attrs or 'login' in form_attrs or 'signin' in form_attrs:
                     continue
                 
-                # Find input fields in the form
-                inputs = form.find_elements(By.XPATH, ".//input[@type='text' or @type='email' or @type='tel' or @type='number' or @type='date']")
-                textareas = form.find_elements(By.XPATH, ".//textarea")
-                selects = form.find_elements(By.XPATH, ".//select")
-                
-                all_inputs = inputs + textareas
-                filled_inputs = 0
+                fill_values = []
+                select_indexes = []
                 
                 # Fill in text inputs and textareas
-                for input_field in all_inputs:
-                    if not (input_field.is_displayed() and input_field.is_enabled()):
-                        continue
-                        
-                    input_type = input_field.get_attribute('type') or ''
-                    input_name = input_field.get_attribute('name') or ''
-                    input_id = input_field.get_attribute('id') or ''
-                    
-                    # Clear any existing text
-                    input_field.clear()
-                    
+                for field in form['fields']:
                     # Determine what kind of data to enter
-                    if input_type == 'email' or 'email' in input_name.lower() or 'email' in input_id.lower():
-                        value = random.choice(self.sample_data['email'])
-                    elif input_type == 'number' or 'number' in input_name.lower() or 'number' in input_id.lower():
-                        value = random.choice(self.sample_data['number'])
-                    elif input_type == 'date' or 'date' in input_name.lower() or 'date' in input_id.lower():
-                        value = random.choice(self.sample_data['date'])
-                    else:
-                        value = random.choice(self.sample_data['text'])
+                    kind = self.classify_field(f"{field['type']}|{field['name']}|{field['id']}", self.GENERAL_FIELD_KINDS)
+                    value = self.rng.choice(self.sample_data[kind])
                     
                     self.logger.info(f"Entering '{value}' in form field")
-                    input_field.send_keys(value)
-                    filled_inputs += 1
+                    fill_values.append([field['element'], value])
                 
                 # Handle select dropdowns
-                for select in selects:
-                    if not (select.is_displayed() and select.is_enabled()):
-                        continue
-                    
+                for select in form['selects']:
+                    # Skip the first option (usually a placeholder) if there are multiple options
+                    if select['option_count'] > 1:
+                        select_indexes.append([select['element'], self.rng.randrange(1, select['option_count'])])
+                
+                filled_inputs = len(fill_values) + len(select_indexes)
+                if filled_inputs > 0:
                     try:
-                        # Find all options in the select
-                        options = select.find_elements(By.XPATH, ".//option")
-                        
-                        # Skip the first option (usually a placeholder) if there are multiple options
-                        if len(options) > 1:
-                            option_to_select = random.choice(options[1:])
-                            option_to_select.click()
-                            filled_inputs += 1
-                    except Exception as e:
-                        self.logger.debug(f"Error interacting with select element: {e}")
+                        self.fill_form_fields(driver, fill_values, select_indexes)
+                    except WebDriverException as e:
+                        self.logger.debug(f"Error filling general form: {e}")
+                        continue
                 
                 # If we filled in any inputs, try to find a submit button but don't actually submit
                 if filled_inputs > 0:
@@ -672,98 +1179,101 @@ class CookieSpider(scrapy.Spider):
     
     def calculate_cookie_age(self, expiry_timestamp, current_time):
         """Calculate the age of a cookie based on its expiration time"""
-        age_info = {
-            'seconds': None,
-            'days': None,
-            'readable': 'Session cookie (expires when browser closes)',
-            'is_session': True
-        }
-        
         # If expiry is None or empty, it's a session cookie
         if not expiry_timestamp:
-            return age_info
+            return SESSION_AGE_INFO
         
+        # Convert to float if it's not already; unparseable expiries count as session cookies
         try:
-            # Convert to float if it's not already
             expiry_timestamp = float(expiry_timestamp)
-            
-            # Calculate age in seconds
-            age_seconds = expiry_timestamp - current_time
-            
-            # If expiry is in the past, mark as expired
-            if age_seconds <= 0:
-                return {
-                    'seconds': age_seconds,
-                    'days': age_seconds / 86400,  # Convert to days
-                    'readable': 'Expired',
-                    'is_session': False
-                }
-            
-            # Calculate age in days
-            age_days = age_seconds / 86400
-            
-            # Create human-readable format
-            if age_days < 1:
-                hours = age_seconds / 3600
-                if hours < 1:
-                    minutes = age_seconds / 60
-                    readable = f"{int(minutes)} minute{'s' if minutes != 1 else ''}"
-                else:
-                    readable = f"{int(hours)} hour{'s' if hours != 1 else ''}"
-            elif age_days < 30:
-                readable = f"{int(age_days)} day{'s' if age_days != 1 else ''}"
-            elif age_days < 365:
-                months = age_days / 30
-                readable = f"{int(months)} month{'s' if months != 1 else ''}"
-            else:
-                years = age_days / 365
-                readable = f"{int(years)} year{'s' if years != 1 else ''}"
-            
+        except (ValueError, TypeError):
+            return SESSION_AGE_INFO
+        
+        # Calculate age in seconds
+        age_seconds = expiry_timestamp - current_time
+        
+        # If expiry is in the past, mark as expired
+        if age_seconds <= 0:
             return {
                 'seconds': age_seconds,
-                'days': age_days,
+                'days': age_seconds / 86400,  # Convert to days
+                'readable': 'Expired',
+                'is_session': False
+            }
+        
+        # Calculate age in days
+        age_days = age_seconds / 86400
+        
+        return {
+            'seconds': age_seconds,
+            'days': age_days,
+            'readable': _readable_age(age_seconds),
+            'is_session': False
+        }
+    
+    def calculate_cookie_ages(self, expiry_timestamps, current_time):
+        """Calculate ages for a batch of expiry timestamps, vectorized for large batches
+        
+        Gives the same results as calling calculate_cookie_age on each timestamp
+        """
+        if len(expiry_timestamps) < VECTORIZED_AGE_MIN_COOKIES:
+            return [self.calculate_cookie_age(expiry, current_time) for expiry in expiry_timestamps]
+        
+        # Cookies without an expiry are session cookies; the scalar path describes those
+        ages = [None] * len(expiry_timestamps)
+        timed = []
+        for i, expiry in enumerate(expiry_timestamps):
+            if expiry:
+                timed.append(i)
+            else:
+                ages[i] = self.calculate_cookie_age(expiry, current_time)
+        if not timed:
+            return ages
+        
+        age_seconds, age_days, unit_codes, amounts = _compute_ages(
+            np.array([expiry_timestamps[i] for i in timed], dtype=np.float64), current_time)
+        
+        for i, seconds, days, code, amount in zip(timed, age_seconds.tolist(), age_days.tolist(),
+                                                  unit_codes.tolist(), amounts.tolist()):
+            if code == AGE_EXPIRED:
+                readable = 'Expired'
+            else:
+                readable = f"{int(amount)} {AGE_UNITS[code]}{'s' if amount != 1 else ''}"
+            ages[i] = {
+                'seconds': seconds,
+                'days': days,
                 'readable': readable,
                 'is_session': False
             }
-        except (ValueError, TypeError):
-            # If conversion fails, assume it's a session cookie
-            return age_info
+        return ages
     
-    def click_interactive_elements(self, domain):
+    def click_interactive_elements(self, driver, domain):
         """Click on buttons, links, or other interactive elements"""
         # Get the base domain for comparison
         base_domain = self.extract_base_domain(domain)
         self.logger.info(f"Looking for interactive elements on domain: {base_domain}")
         
-        # Selectors for common interactive elements
-        interactive_selectors = [
-            # Links with href attributes (to check domain)
-            "//a[@href and not(contains(@href, 'login') or contains(@href, 'signin'))]",
-            # Buttons that aren't submit buttons
-            "//button[not(contains(@type, 'submit'))][not(contains(., 'login') or contains(., 'Login') or contains(., 'sign'))]",
-            # Divs with button role
-            "//div[@role='button']",
-            # Elements with button class
-            "//*[contains(@class, 'button') and not(contains(@class, 'login') or contains(@class, 'signin'))]"
-        ]
-        
         # First try to find links that stay within the same domain
         try:
-            # Find all links
-            links = self.driver.find_elements(By.XPATH, "//a[@href]")
+            # Fetch every visible link with its resolved href and label in one round trip
+            links = driver.execute_script("""
+                var links = [];
+                document.querySelectorAll(arguments[0]).forEach(function (a) {
+                    // SVG links expose href as an object rather than a URL string
+                    if (typeof a.href === 'string' && a.href && (a.offsetWidth || a.offsetHeight || a.getClientRects().length)) {
+                        links.push({element: a, href: a.href, text: (a.innerText || '').trim()});
+                    }
+                });
+                return links;
+            """, self.LINK_CSS) or []
             same_domain_links = []
             
             for link in links:
-                if not (link.is_displayed() and link.is_enabled()):
-                    continue
-                    
-                href = link.get_attribute('href')
-                if not href:
-                    continue
-                    
+                href = link['href']
+                
                 # Check if the link is to the same domain
                 try:
-                    link_domain = urlparse(href).netloc
+                    link_domain = _urlparse(href).netloc
                     link_base_domain = self.extract_base_domain(link_domain)
                     
                     # Only include links to the same domain
@@ -775,11 +1285,11 @@ class CookieSpider(scrapy.Spider):
             
             # If we found same-domain links, click on one randomly
             if same_domain_links:
-                link_to_click = random.choice(same_domain_links)
-                link_text = link_to_click.text or link_to_click.get_attribute('href') or 'unnamed link'
+                link_to_click = self.rng.choice(same_domain_links)
+                link_text = link_to_click['text'] or link_to_click['href'] or 'unnamed link'
                 self.logger.info(f"Clicking on same-domain link: {link_text}")
-                link_to_click.click()
-                time.sleep(2)  # Wait for page to load
+                link_to_click['element'].click()
+                self.wait_for_page_settled(driver, timeout=2)  # Wait for page to load
                 return True
             else:
                 self.logger.info(f"No same-domain links found on {domain}")
@@ -787,21 +1297,30 @@ class CookieSpider(scrapy.Spider):
             self.logger.debug(f"Error finding same-domain links: {e}")
         
         # If no same-domain links were found or clicked, try other interactive elements
-        for selector in interactive_selectors:
+        for selector, skip_text in self.INTERACTIVE_SELECTORS:
             try:
-                elements = self.driver.find_elements(By.XPATH, selector)
+                # Visible, enabled matches with their label and id, in one round trip
+                elements = driver.execute_script("""
+                    var matches = [];
+                    document.querySelectorAll(arguments[0]).forEach(function (el) {
+                        if (!el.disabled && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)) {
+                            matches.push({element: el, text: (el.innerText || '').trim(), id: el.id || ''});
+                        }
+                    });
+                    return matches;
+                """, selector) or []
                 
-                # Filter visible elements
-                visible_elements = [e for e in elements if e.is_displayed() and e.is_enabled()]
+                # Filter out elements whose text marks them as off-limits
+                visible_elements = [e for e in elements if not (skip_text and skip_text.search(e['text']))]
                 
                 if visible_elements:
                     # Take a random element to click
-                    element_to_click = random.choice(visible_elements)
-                    element_text = element_to_click.text or element_to_click.get_attribute('id') or 'unnamed element'
+                    element_to_click = self.rng.choice(visible_elements)
+                    element_text = element_to_click['text'] or element_to_click['id'] or 'unnamed element'
                     
                     self.logger.info(f"Clicking on interactive element: {element_text}")
-                    element_to_click.click()
-                    time.sleep(2)  # Wait for any page changes
+                    element_to_click['element'].click()
+                    self.wait_for_page_settled(driver, timeout=2)  # Wait for any page changes
                     return True
             except Exception as e:
                 self.logger.debug(f"Error with interactive element selector {selector}: {e}")
@@ -810,30 +1329,12 @@ class CookieSpider(scrapy.Spider):
         
     def extract_base_domain(self, domain):
         """Extract the base domain (e.g., example.com from www.example.com)"""
-        if not domain:
-            return ""
-            
-        # Remove port if present
-        if ':' in domain:
-            domain = domain.split(':', 1)[0]
-            
-        parts = domain.split('.')
-        
-        # Handle special cases like co.uk, com.au
-        if len(parts) > 2:
-            if parts[-2] in ['co', 'com', 'org', 'net', 'edu', 'gov'] and parts[-1] in ['uk', 'au', 'nz', 'jp']:
-                return '.'.join(parts[-3:])
-        
-        # Return the last two parts for normal domains (example.com)
-        if len(parts) >= 2:
-            return '.'.join(parts[-2:])
-        
-        return domain
+        return _base_domain(domain)
     
     def parse_without_selenium(self, response):
         """Parse using regular Scrapy response (fallback method)"""
         # Extract domain name for file naming
-        domain = urlparse(response.url).netloc
+        domain = _urlparse(response.url).netloc
         
         # Log status code and check for redirects
         self.logger.info(f"Processing {response.url} with status code {response.status}")
@@ -845,7 +1346,7 @@ class CookieSpider(scrapy.Spider):
             self.logger.info(f"Followed redirect from {original_url} to {response.url}")
             
             # Update domain if it changed due to redirect
-            original_domain = urlparse(original_url).netloc
+            original_domain = _urlparse(original_url).netloc
             if original_domain != domain:
                 self.logger.info(f"Domain changed from {original_domain} to {domain} due to redirect")
         
@@ -857,80 +1358,69 @@ class CookieSpider(scrapy.Spider):
             self.logger.info(f"Found {len(cookies)} cookies for {domain} without Selenium")
             
             cookie_data = []
+            expiry_timestamps = []
             for cookie_str in cookies:
                 try:
                     # Convert bytes to string
                     cookie_str = cookie_str.decode('utf-8')
                     
                     # Parse cookie string
-                    parts = cookie_str.split(';')
-                    main_part = parts[0].strip()
+                    parsed = _parse_set_cookie(cookie_str)
                     
-                    if '=' in main_part:
-                        name, value = main_part.split('=', 1)
-                        
-                        # Extract other cookie attributes
-                        attributes = {}
-                        for part in parts[1:]:
-                            part = part.strip()
-                            if '=' in part:
-                                k, v = part.split('=', 1)
-                                attributes[k.lower()] = v
-                            else:
-                                attributes[part.lower()] = True
+                    if parsed:
+                        name, value, flags, kv = parsed
                         
                         # Parse expires date if available
-                        expires_str = attributes.get('expires', '')
+                        expires_str = kv.get('expires', '')
                         expiry_timestamp = None
                         if expires_str:
                             try:
-                                # Try to parse the expires date string to a timestamp
-                                expires_date = datetime.strptime(expires_str, "%a, %d %b %Y %H:%M:%S %Z")
+                                # RFC 1123 / cookie dates, including the dashed Netscape form
+                                expires_date = parsedate_to_datetime(expires_str)
+                                # A -0000 zone parses as naive but still means UTC
+                                if expires_date.tzinfo is None:
+                                    expires_date = expires_date.replace(tzinfo=timezone.utc)
                                 expiry_timestamp = expires_date.timestamp()
                             except (ValueError, TypeError):
-                                try:
-                                    # Try alternative format
-                                    expires_date = datetime.strptime(expires_str, "%a, %d-%b-%Y %H:%M:%S %Z")
-                                    expiry_timestamp = expires_date.timestamp()
-                                except (ValueError, TypeError):
-                                    # If parsing fails, leave as None
-                                    pass
-                        
-                        # Calculate cookie age
-                        age_info = self.calculate_cookie_age(expiry_timestamp, time.time())
+                                # If parsing fails, leave as None
+                                pass
                         
+                        # Ages are filled in below for the whole batch at once
                         cookie_info = {
                             'name': name,
                             'value': value,
-                            'domain': attributes.get('domain', domain),
-                            'path': attributes.get('path', '/'),
-                            'expires': attributes.get('expires', ''),
-                            'secure': 'secure' in attributes,
-                            'httponly': 'httponly' in attributes,
-                            'samesite': attributes.get('samesite', ''),
-                            'age': age_info
+                            'domain': kv.get('domain', domain),
+                            'path': kv.get('path', '/'),
+                            'expires': expires_str,
+                            'secure': 'secure' in flags,
+                            'httponly': 'httponly' in flags,
+                            'samesite': kv.get('samesite', ''),
+                            'age': None
                         }
                         
                         cookie_data.append(cookie_info)
+                        expiry_timestamps.append(expiry_timestamp)
                     
                 except Exception as e:
                     self.logger.error(f"Error parsing cookie: {e}")
             
+            # Calculate cookie ages
+            for cookie_info, age_info in zip(cookie_data, self.calculate_cookie_ages(expiry_timestamps, time.time())):
+                cookie_info['age'] = age_info
+            
             # Save cookies to file
             if cookie_data:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{domain.replace('.', '_')}_{timestamp}.json"
-                filepath = os.path.join(self.cookies_dir, filename)
+                # One clock read for both the filename and the saved timestamp
+                saved_at = datetime.now()
+                filepath = self.result_filepath(domain, saved_at)
                 
-                with open(filepath, 'w') as f:
-                    json.dump({
-                        'url': response.url,
-                        'timestamp': datetime.now().isoformat(),
-                        'cookies': cookie_data,
-                        'source': 'scrapy'
-                    }, f, indent=4)
+                self.writer.submit(self.write_result, filepath, {
+                    'url': response.url,
+                    'timestamp': saved_at,
+                    'cookies': cookie_data,
+                    'source': 'scrapy'
+                })
                 
-                self.logger.info(f"Saved cookies to {filepath}")
                 return {
                     'domain': domain,
                     'url': response.url,
@@ -4,34 +4,194 @@ Utility functions for analyzing and managing cookies collected by the cookie spi
 """
 import os
 import json
+try:
+    import orjson  # Much faster parsing of the many small cookie files
+except ImportError:
+    orjson = None
 import argparse
 from datetime import datetime
 import pandas as pd
 from tabulate import tabulate
-import matplotlib.pyplot as plt
 import numpy as np
+# Charts are only ever written to PNG files: pin the non-interactive Agg backend
+# before matplotlib loads, for this process and any it starts
+os.environ.setdefault('MPLBACKEND', 'Agg')
 import matplotlib
+matplotlib.use('Agg')
+matplotlib.interactive(False)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import collections
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import functools
+import io
 from urllib.parse import urlparse, unquote
 import re
 import tldextract  # For better domain parsing
-matplotlib.use('Agg')  # Use non-interactive backend
+try:
+    import re2  # google-re2: linear-time matching for the XSS scan of ASCII values
+except ImportError:
+    re2 = None
+try:
+    import ahocorasick  # pyahocorasick: one automaton pass for the XSS literal prefilter
+except ImportError:
+    ahocorasick = None
+try:
+    import hyperscan  # Intel Hyperscan: all XSS patterns matched in one automaton pass
+except ImportError:
+    hyperscan = None
+
+
+# Longest cookie value scanned; browsers cap a whole cookie at 4 KB, so anything
+# longer is not real cookie data and only serves to slow the scan down
+XSS_SCAN_MAX_LENGTH = 4096
+
+# Common XSS payload patterns to check for. Tag attributes are length-bounded so
+# a value with many unclosed tags can't make one pattern rescan it to the end
+# from every tag start
+_XSS_RAW_PATTERNS = [
+    r'<script\b[^>]{0,256}>',               # Basic script tags
+    r'javascript\s*:',                      # JavaScript protocol
+    r'\bon\w+\s*=',                         # Event handlers (onclick, onload, etc.)
+    r'\beval\s*\(',                         # eval() function
+    r'document\.cookie',                    # Cookie manipulation
+    r'document\.location',                  # Location manipulation
+    r'<img\b[^>]{0,128}\bonerror\b[^>]{0,256}>',  # Image onerror
+    r'<iframe\b[^>]{0,256}>',               # iframes
+    r'\balert\s*\(',                        # alert() function
+    r'\bprompt\s*\(',                       # prompt() function
+    r'\bconfirm\s*\(',                      # confirm() function
+    r'\bdocument\.write\s*\(',              # document.write()
+    r'\bdocument\.domain',                  # document.domain manipulation
+    r'\blocation\.href',                    # location.href manipulation
+    r'\blocation\.replace\s*\(',            # location.replace()
+    r'\bwindow\.open\s*\(',                 # window.open()
+    r'data:text/html',                      # Data URI with HTML
+    r'&#x[0-9a-fA-F]+;',                    # Hex entity encoding
+    r'&#[0-9]+;',                           # Decimal entity encoding
+    r'\\x[0-9a-fA-F]{2}',                   # Hex escape sequences
+    r'\\u[0-9a-fA-F]{4}'                    # Unicode escape sequences
+]
+
+# Compiled once at import: each pattern on its own, plus one alternation that
+# finds most matches in a single pass, with group p<i> for _XSS_RAW_PATTERNS[i]
+_XSS_COMPILED = [re.compile(f'(?i){pattern}') for pattern in _XSS_RAW_PATTERNS]
+_XSS_PATTERN_RE = re.compile(
+    '(?i)' + '|'.join(f'(?P<p{i}>(?:{pattern}))' for i, pattern in enumerate(_XSS_RAW_PATTERNS)))
+
+# re2 is not a drop-in for re on arbitrary text: its \b, \w and case folding are
+# ASCII-only (so İ doesn't match i, and ﬀ isn't a word character), and its \s
+# leaves out \v and \x1c-\x1f. On ASCII text, with \s spelled out as re's ASCII
+# whitespace, it matches exactly like re, so it only ever scans ASCII values;
+# everything else goes through the re patterns above. re2 takes no flags
+# argument, so case-insensitivity is set inline with (?i)
+_XSS_ASCII_PATTERNS = [
+    re.sub(r'(?<!\\)\\s', lambda m: r'[\t\n\x0b\x0c\r\x1c-\x1f ]', pattern)
+    for pattern in _XSS_RAW_PATTERNS
+]
+if re2:
+    _XSS_ASCII_COMPILED = [re2.compile(f'(?i){pattern}') for pattern in _XSS_ASCII_PATTERNS]
+    _XSS_ASCII_PATTERN_RE = re2.compile(
+        '(?i)' + '|'.join(f'(?P<p{i}>(?:{pattern}))' for i, pattern in enumerate(_XSS_ASCII_PATTERNS)))
+else:
+    _XSS_ASCII_COMPILED = _XSS_ASCII_PATTERN_RE = None
+
+# With Hyperscan, one database reports every pattern that matches, overlapping
+# matches included, in a single scan of the value; pattern ids are indexes into
+# _XSS_RAW_PATTERNS. Like re2, its \b, \w, \s and case folding are ASCII-only,
+# so it is built from _XSS_ASCII_PATTERNS and only scans ASCII values
+if hyperscan:
+    _XSS_HS_DB = hyperscan.Database()
+    _XSS_HS_DB.compile(
+        expressions=[pattern.encode() for pattern in _XSS_ASCII_PATTERNS],
+        ids=list(range(len(_XSS_RAW_PATTERNS))),
+        elements=len(_XSS_RAW_PATTERNS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH]
+        * len(_XSS_RAW_PATTERNS))
+else:
+    _XSS_HS_DB = None
+
+# Substrings at least one of which every XSS pattern needs (in casefolded text);
+# a value containing none of them can't match, so the regexes are skipped
+_XSS_LITERALS = (
+    'script', 'on', 'eval', 'document.', '<img', 'iframe', 'alert', 'prompt', 'confirm',
+    'location.', 'window.open', 'data:text/html', '&#', '\\x', '\\u'
+)
+
+# Non-ASCII values are scanned with re, whose case-insensitive matching lets
+# dotted and dotless I (İ, ı) match i; casefold() doesn't turn them into it, so
+# folded text for the prefilter gets the same treatment and those values aren't skipped
+_XSS_FOLD_FIXUPS = str.maketrans({'\u0131': 'i', '\u0307': None})
+
+# With pyahocorasick, all literals are found in a single scan instead of one scan each
+if ahocorasick:
+    _XSS_AUTOMATON = ahocorasick.Automaton()
+    for needle in _XSS_LITERALS:
+        _XSS_AUTOMATON.add_word(needle, needle)
+    _XSS_AUTOMATON.make_automaton()
+else:
+    _XSS_AUTOMATON = None
+
+
+def _has_xss_literal(lowered):
+    """Whether a casefolded value contains any of the literals the XSS patterns need."""
+    if _XSS_AUTOMATON is not None:
+        return next(_XSS_AUTOMATON.iter(lowered), None) is not None
+    return any(needle in lowered for needle in _XSS_LITERALS)
+
+
+def _collect_hyperscan_id(pattern_id, start, end, flags, found):
+    """Hyperscan match handler: record the id of the pattern that matched."""
+    found.add(pattern_id)
+
+
+def _hyperscan_xss_ids(value):
+    """Indexes of the XSS patterns matching an ASCII value, from one Hyperscan pass."""
+    found = set()
+    _XSS_HS_DB.scan(value.encode('ascii'), match_event_handler=_collect_hyperscan_id, context=found)
+    return found
+
+
+# One extractor for the whole run, using the suffix list bundled with tldextract
+# so lookups never fetch it over the network or rebuild it
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+@functools.lru_cache(maxsize=100_000)
+def _registered_domain(host):
+    """Registered domain of a host (example.com from www.example.com); hosts repeat across cookies."""
+    extract = _TLD_EXTRACT(host)
+    return f"{extract.domain}.{extract.suffix}"
+
+
+# main() runs several analyses over the same files, each parsing every page URL;
+# ParseResult is an immutable tuple, so parses are safe to share
+_urlparse = functools.lru_cache(maxsize=1024)(urlparse)
+
+
+def _load_one(entry):
+    """Load one cookie file from a directory entry, or None if it can't be read."""
+    try:
+        # Unbuffered: the file is read whole in one go, so a BufferedReader only adds a copy
+        with open(entry.path, 'rb', buffering=0) as f:
+            cookie_data = orjson.loads(f.read()) if orjson else json.load(f)
+            cookie_data['file'] = entry.name
+            return cookie_data
+    except Exception as e:
+        print(f"Error loading {entry.name}: {e}")
+        return None
 
 
 def load_cookie_files(cookies_dir):
     """Load all cookie files from the specified directory."""
-    cookie_files = []
-    for filename in os.listdir(cookies_dir):
-        if filename.endswith('.json'):
-            filepath = os.path.join(cookies_dir, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    cookie_data = json.load(f)
-                    cookie_data['file'] = filename
-                    cookie_files.append(cookie_data)
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
-    return cookie_files
+    with os.scandir(cookies_dir) as entries:
+        # DirEntry caches the type from the directory read, so is_file() needs no stat
+        json_entries = [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+    
+    # Files are read and parsed on a thread pool; map keeps directory order
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4)) as executor:
+        return [cookie_data for cookie_data in executor.map(_load_one, json_entries) if cookie_data is not None]
 
 
 def analyze_xss_vulnerabilities(cookie_files):
@@ -55,15 +215,15 @@ def analyze_xss_vulnerabilities(cookie_files):
     stats = _initialize_xss_stats()
     
     # Get compiled XSS patterns
-    compiled_patterns, xss_patterns = _get_xss_patterns()
+    fused_pattern, compiled_patterns, xss_patterns = _get_xss_patterns()
     
     # Process each cookie file
     for data in cookie_files:
         url = data.get('url', 'unknown')
-        domain = urlparse(url).netloc
+        domain = _urlparse(url).netloc
         
         # Process all cookies in this file
-        _process_cookies_for_xss(data, domain, stats, compiled_patterns, xss_patterns)
+        _process_cookies_for_xss(data, domain, stats, fused_pattern, compiled_patterns, xss_patterns)
     
     return stats
 
@@ -81,47 +241,22 @@ def _initialize_xss_stats():
     }
 
 def _get_xss_patterns():
-    """Define and compile XSS detection patterns.
+    """Return the XSS detection patterns, compiled at import.
     
     Returns:
-        Tuple of (compiled_patterns, raw_patterns)
+        Tuple of (fused_pattern, compiled_patterns, raw_patterns), where fused_pattern
+        is one alternation of every pattern with group p<i> for raw_patterns[i]
     """
-    # Common XSS payload patterns to check for
-    xss_patterns = [
-        r'<script[^>]*>',                      # Basic script tags
-        r'javascript\s*:',                      # JavaScript protocol
-        r'\bon\w+\s*=',                         # Event handlers (onclick, onload, etc.)
-        r'\beval\s*\(',                         # eval() function
-        r'document\.cookie',                    # Cookie manipulation
-        r'document\.location',                  # Location manipulation
-        r'<img[^>]*\bonerror\b[^>]*>',          # Image onerror
-        r'<iframe[^>]*>',                       # iframes
-        r'\balert\s*\(',                        # alert() function
-        r'\bprompt\s*\(',                       # prompt() function
-        r'\bconfirm\s*\(',                      # confirm() function
-        r'\bdocument\.write\s*\(',              # document.write()
-        r'\bdocument\.domain',                  # document.domain manipulation
-        r'\blocation\.href',                    # location.href manipulation
-        r'\blocation\.replace\s*\(',            # location.replace()
-        r'\bwindow\.open\s*\(',                 # window.open()
-        r'data:text/html',                      # Data URI with HTML
-        r'&#x[0-9a-fA-F]+;',                    # Hex entity encoding
-        r'&#[0-9]+;',                           # Decimal entity encoding
-        r'\\x[0-9a-fA-F]{2}',                   # Hex escape sequences
-        r'\\u[0-9a-fA-F]{4}'                    # Unicode escape sequences
-    ]
-    
-    # Compile all patterns for efficiency
-    compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in xss_patterns]
-    return compiled_patterns, xss_patterns
+    return _XSS_PATTERN_RE, _XSS_COMPILED, _XSS_RAW_PATTERNS
 
-def _process_cookies_for_xss(data, domain, stats, compiled_patterns, xss_patterns):
+def _process_cookies_for_xss(data, domain, stats, fused_pattern, compiled_patterns, xss_patterns):
     """Process cookies from a single data file for XSS vulnerabilities.
     
     Args:
         data: Cookie data file content
         domain: Domain being analyzed
         stats: Statistics dictionary to update
+        fused_pattern: Single alternation of all XSS patterns
         compiled_patterns: Compiled regex patterns for XSS detection
         xss_patterns: Raw XSS patterns for reporting
     """
@@ -136,38 +271,63 @@ def _process_cookies_for_xss(data, domain, stats, compiled_patterns, xss_pattern
             continue
         
         # Check for XSS in this cookie
-        matched_patterns = _check_cookie_for_xss(cookie_value, compiled_patterns, xss_patterns)
+        matched_patterns = _check_cookie_for_xss(cookie_value, fused_pattern, compiled_patterns, xss_patterns)
         
         # If vulnerable, update statistics
         if matched_patterns:
             _update_xss_stats(stats, domain, cookie, cookie_name, cookie_domain, matched_patterns)
 
-def _check_cookie_for_xss(cookie_value, compiled_patterns, xss_patterns):
+def _check_cookie_for_xss(cookie_value, fused_pattern, compiled_patterns, xss_patterns):
     """Check a cookie value for XSS patterns.
     
+    Only the first XSS_SCAN_MAX_LENGTH characters of the decoded value are
+    scanned, and the <script>, <img ... onerror> and <iframe> patterns match
+    tags of bounded length, so the scan stays linear in the value length.
+    
     Args:
         cookie_value: The cookie value to check
+        fused_pattern: Single alternation of all XSS patterns
         compiled_patterns: Compiled regex patterns
         xss_patterns: Raw XSS patterns for reporting
         
     Returns:
         List of matched patterns or empty list if none
     """
-    # URL decode the value to check for encoded payloads
+    # URL decode the value to check for encoded payloads; only values with a
+    # percent-escape can change, so the rest skip the decode and its copy
     try:
-        decoded_value = unquote(cookie_value)
+        decoded_value = unquote(cookie_value) if '%' in cookie_value else cookie_value
     except (TypeError, ValueError) as e:
         # Specify exact exceptions to catch
         decoded_value = cookie_value
-    
-    # Check for potential XSS patterns
-    matched_patterns = []
-    
-    for i, pattern in enumerate(compiled_patterns):
-        if pattern.search(decoded_value):
-            matched_patterns.append(xss_patterns[i])
-    
-    return matched_patterns
+    decoded_value = decoded_value[:XSS_SCAN_MAX_LENGTH]
+    
+    # Substring checks rule out most values before any regex runs
+    if not _has_xss_literal(decoded_value.casefold().translate(_XSS_FOLD_FIXUPS)):
+        return []
+    
+    # Hyperscan and re2 match exactly like re on ASCII text only (see _XSS_ASCII_PATTERNS)
+    if decoded_value.isascii():
+        # Hyperscan finds every matching pattern at once, so nothing is left to recheck
+        if _XSS_HS_DB is not None:
+            return [xss_patterns[i] for i in sorted(_hyperscan_xss_ids(decoded_value))]
+        if _XSS_ASCII_PATTERN_RE is not None:
+            fused_pattern, compiled_patterns = _XSS_ASCII_PATTERN_RE, _XSS_ASCII_COMPILED
+    
+    # One pass over the value; the group that matched names the pattern
+    found = {int(match.lastgroup[1:]) for match in fused_pattern.finditer(decoded_value)}
+    
+    # Most values match nothing, which the single pass settles on its own
+    if not found:
+        return []
+    
+    # A match consumes its text, hiding any other pattern that overlaps it
+    # (like the onerror= inside an <img> tag), so check the rest one by one
+    return [
+        xss_patterns[i]
+        for i, pattern in enumerate(compiled_patterns)
+        if i in found or pattern.search(decoded_value)
+    ]
 
 def _update_xss_stats(stats, domain, cookie, cookie_name, cookie_domain, matched_patterns):
     """Update XSS statistics when a vulnerable cookie is found.
@@ -211,6 +371,38 @@ def _update_xss_stats(stats, domain, cookie, cookie_name, cookie_domain, matched
     stats['xss_findings'].append(finding)
 
 
+def _record_third_party(fp_entry, third_party_seen, third_party_purposes, third_party_registered,
+                        cookie_name, purpose=None):
+    """Record one third-party cookie seen on a first-party domain.
+    
+    Args:
+        fp_entry: The first-party domain's relationship entry
+        third_party_seen: List of third-party domains seen, one per cookie
+        third_party_purposes: Tracking purpose counts per third-party domain
+        third_party_registered: Registered domain of the third party
+        cookie_name: Name of the cookie
+        purpose: Tracking purpose, or None if the cookie doesn't carry one
+    """
+    tp_map = fp_entry['third_parties']
+    if third_party_registered not in tp_map:
+        tp_map[third_party_registered] = {
+            'count': 0,
+            'purposes': set(),
+            'cookie_names': []
+        }
+    tp_entry = tp_map[third_party_registered]
+    
+    # Update counts and details
+    tp_entry['count'] += 1
+    fp_entry['total_third_party_cookies'] += 1
+    tp_entry['cookie_names'].append(cookie_name)
+    third_party_seen.append(third_party_registered)
+    
+    if purpose is not None:
+        tp_entry['purposes'].add(purpose)
+        third_party_purposes[third_party_registered][purpose] += 1
+
+
 def analyze_domain_relationships(cookie_files):
     """Analyze domain relationships between first-party and third-party cookies.
     
@@ -236,17 +428,18 @@ def analyze_domain_relationships(cookie_files):
         'top_trackers': []           # Most common third-party trackers
     }
     
+    # Every third-party registered domain seen, once per cookie, counted at the end
+    third_party_seen = []
+    # Tracking purpose counts per third-party domain
+    third_party_purposes = collections.defaultdict(collections.Counter)
+    
     # Process each cookie file
     for data in cookie_files:
         url = data.get('url', 'unknown')
-        first_party_domain = urlparse(url).netloc
+        first_party_domain = _urlparse(url).netloc
         
         # Extract registered domain (e.g., example.com from www.example.com)
-        try:
-            extract = tldextract.extract(first_party_domain)
-            first_party_registered = f"{extract.domain}.{extract.suffix}"
-        except:
-            first_party_registered = first_party_domain
+        first_party_registered = _registered_domain(first_party_domain)
         
         # Initialize domain relationship entry if it doesn't exist
         if first_party_registered not in stats['domain_relationships']:
@@ -254,6 +447,7 @@ def analyze_domain_relationships(cookie_files):
                 'third_parties': {},
                 'total_third_party_cookies': 0
             }
+        fp_entry = stats['domain_relationships'][first_party_registered]
         
         # Process explicitly identified third-party cookies if available
         third_party_cookies = data.get('third_party_cookies', [])
@@ -268,44 +462,15 @@ def analyze_domain_relationships(cookie_files):
                     cookie_domain = cookie_domain[1:]
                 
                 # Extract registered domain
-                try:
-                    extract = tldextract.extract(cookie_domain)
-                    third_party_registered = f"{extract.domain}.{extract.suffix}"
-                except:
-                    third_party_registered = cookie_domain
+                third_party_registered = _registered_domain(cookie_domain)
                 
                 # Skip if it's actually the same domain
                 if third_party_registered == first_party_registered:
                     continue
                 
-                # Update domain relationships
-                if third_party_registered not in stats['domain_relationships'][first_party_registered]['third_parties']:
-                    stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered] = {
-                        'count': 0,
-                        'purposes': set(),
-                        'cookie_names': []
-                    }
-                
-                # Update counts and details
-                stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered]['count'] += 1
-                stats['domain_relationships'][first_party_registered]['total_third_party_cookies'] += 1
-                
-                # Track cookie name
-                cookie_name = cookie.get('name', 'unknown')
-                stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered]['cookie_names'].append(cookie_name)
-                
-                # Track purpose if available
-                purpose = cookie.get('tracking_purpose', 'Unknown')
-                stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered]['purposes'].add(purpose)
-                
-                # Update global third-party domain counts
-                stats['third_party_domains'][third_party_registered] = stats['third_party_domains'].get(third_party_registered, 0) + 1
-                
-                # Update tracking purposes
-                if third_party_registered not in stats['third_party_purposes']:
-                    stats['third_party_purposes'][third_party_registered] = {}
-                
-                stats['third_party_purposes'][third_party_registered][purpose] = stats['third_party_purposes'].get(third_party_registered, {}).get(purpose, 0) + 1
+                # Update domain relationships, tracking purpose if available
+                _record_third_party(fp_entry, third_party_seen, third_party_purposes, third_party_registered,
+                                    cookie.get('name', 'unknown'), cookie.get('tracking_purpose', 'Unknown'))
         
         # Fall back to analyzing all cookies if no explicit third-party cookies are identified
         elif 'cookies' in data:
@@ -321,39 +486,19 @@ def analyze_domain_relationships(cookie_files):
                     if cookie_domain.startswith('.'):
                         cookie_domain = cookie_domain[1:]
                     
-                    try:
-                        extract = tldextract.extract(cookie_domain)
-                        third_party_registered = f"{extract.domain}.{extract.suffix}"
-                        is_third_party = third_party_registered != first_party_registered
-                    except:
-                        is_third_party = cookie_domain != first_party_domain
+                    is_third_party = _registered_domain(cookie_domain) != first_party_registered
                 
                 if is_third_party:
                     # Process as third-party cookie
-                    try:
-                        extract = tldextract.extract(cookie_domain)
-                        third_party_registered = f"{extract.domain}.{extract.suffix}"
-                    except:
-                        third_party_registered = cookie_domain
+                    third_party_registered = _registered_domain(cookie_domain)
                     
                     # Update domain relationships
-                    if third_party_registered not in stats['domain_relationships'][first_party_registered]['third_parties']:
-                        stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered] = {
-                            'count': 0,
-                            'purposes': set(),
-                            'cookie_names': []
-                        }
-                    
-                    # Update counts and details
-                    stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered]['count'] += 1
-                    stats['domain_relationships'][first_party_registered]['total_third_party_cookies'] += 1
-                    
-                    # Track cookie name
-                    cookie_name = cookie.get('name', 'unknown')
-                    stats['domain_relationships'][first_party_registered]['third_parties'][third_party_registered]['cookie_names'].append(cookie_name)
-                    
-                    # Update global third-party domain counts
-                    stats['third_party_domains'][third_party_registered] = stats['third_party_domains'].get(third_party_registered, 0) + 1
+                    _record_third_party(fp_entry, third_party_seen, third_party_purposes, third_party_registered,
+                                        cookie.get('name', 'unknown'))
+    
+    # Global third-party domain counts, in first-seen order
+    stats['third_party_domains'] = dict(collections.Counter(third_party_seen))
+    stats['third_party_purposes'] = {domain: dict(purposes) for domain, purposes in third_party_purposes.items()}
     
     # Convert sets to lists for JSON serialization
     for first_party in stats['domain_relationships']:
@@ -368,6 +513,13 @@ def analyze_domain_relationships(cookie_files):
     return stats
 
 
+# Cookie fields the per-cookie statistics in analyze_cookies read
+COOKIE_FRAME_COLUMNS = ['name', 'domain', 'secure', 'httponly', 'samesite', 'age']
+
+# Recognized SameSite values (lowercased) and how they are reported; anything else is 'unspecified'
+SAMESITE_LABELS = {'none': 'None', 'lax': 'Lax', 'strict': 'Strict'}
+
+
 def analyze_cookies(cookie_files):
     """Analyze cookies and storage data and return statistics."""
     if not cookie_files:
@@ -428,6 +580,7 @@ def analyze_cookies(cookie_files):
         'avg_cookie_age_days': 0,
         'max_cookie_age_days': 0,
         'cookie_age_distribution': {},
+        'cookie_age_ranges': [0] * len(AGE_RANGE_LABELS),
         'samesite_stats': {
             'None': 0,
             'Lax': 0,
@@ -437,6 +590,79 @@ def analyze_cookies(cookie_files):
         'samesite_by_domain': {}
     }
     
+    # One row per cookie across all files, so the per-cookie counts below are
+    # column reductions rather than dictionary updates in a Python loop
+    cookie_frame = pd.DataFrame(
+        [cookie for data in cookie_files for cookie in data.get('cookies', [])],
+        columns=COOKIE_FRAME_COLUMNS)
+    
+    # The page each cookie was collected on, and that page's last two host labels
+    cookie_counts = [len(data.get('cookies', [])) for data in cookie_files]
+    cookie_frame['page'] = np.repeat(
+        np.array([data.get('url', 'unknown') for data in cookie_files], dtype=object), cookie_counts)
+    cookie_frame['main_domain'] = np.repeat(np.array([
+        '.'.join(_urlparse(data['url']).netloc.rsplit('.', 2)[-2:]) if 'url' in data else 'unknown'
+        for data in cookie_files
+    ], dtype=object), cookie_counts)
+    
+    # Count cookie names, most common first (ties keep first-seen order)
+    name_counts = cookie_frame['name'].fillna('').value_counts(sort=False)
+    stats['common_cookie_names'] = dict(sorted(
+        name_counts.items(), 
+        key=lambda x: x[1], 
+        reverse=True
+    )[:10])
+    
+    # Count secure and httponly cookies
+    stats['secure_cookies'] = int(cookie_frame['secure'].fillna(False).astype(bool).sum())
+    stats['httponly_cookies'] = int(cookie_frame['httponly'].fillna(False).astype(bool).sum())
+    
+    # Analyze cookie age; cookies without age info count as neither session nor persistent
+    ages = [age_info for age_info in cookie_frame['age'].dropna() if age_info]
+    is_session = np.array([age_info.get('is_session', True) for age_info in ages], dtype=bool)
+    stats['session_cookies'] = int(is_session.sum())
+    stats['persistent_cookies'] = len(ages) - stats['session_cookies']
+    stats['cookie_age_categories']['session'] = stats['session_cookies']
+    
+    age_days = np.array([age_info.get('days') for age_info, session in zip(ages, is_session) if not session], dtype=float)
+    age_days = age_days[~np.isnan(age_days)]
+    
+    # Categorize by age range
+    stats['cookie_age_categories']['expired'] = int((age_days <= 0).sum())
+    stats['cookie_age_categories']['short_term'] = int(((age_days > 0) & (age_days < 1)).sum())
+    stats['cookie_age_categories']['medium_term'] = int(((age_days >= 1) & (age_days <= 30)).sum())
+    stats['cookie_age_categories']['long_term'] = int((age_days > 30).sum())
+    
+    # Round age down to whole days for distribution
+    rounded_ages, age_counts = np.unique(np.maximum(0, np.trunc(age_days)).astype(int), return_counts=True)
+    stats['cookie_age_distribution'] = dict(zip(rounded_ages.tolist(), age_counts.tolist()))
+    # The same distribution summed into AGE_RANGE_LABELS ranges, shared by the chart and the printout
+    stats['cookie_age_ranges'] = _bucket_ages(rounded_ages, age_counts)
+    
+    # Count third-party cookies: a domain unrelated by suffix to the page's main domain
+    stats['third_party_cookies'] = sum(
+        1 for cookie_domain, main_domain in zip(cookie_frame['domain'].fillna(''), cookie_frame['main_domain'])
+        if cookie_domain and not cookie_domain.endswith(main_domain) and not main_domain.endswith(cookie_domain)
+    )
+    
+    # Analyze SameSite attribute, capitalized for consistency
+    samesite = cookie_frame['samesite'].fillna('').astype(str).str.lower().map(SAMESITE_LABELS).fillna('unspecified')
+    for label, count in samesite.value_counts().items():
+        stats['samesite_stats'][label] += int(count)
+    
+    # Domain-specific SameSite stats, in the order the domains first appear
+    samesite_by_domain = samesite.groupby([cookie_frame['page'], samesite], sort=False, dropna=False).size()
+    for (domain, label), count in samesite_by_domain.items():
+        if domain not in stats['samesite_by_domain']:
+            stats['samesite_by_domain'][domain] = {
+                'None': 0,
+                'Lax': 0,
+                'Strict': 0,
+                'unspecified': 0
+            }
+        stats['samesite_by_domain'][domain][label] = int(count)
+    
+    storage_key_counts = collections.Counter()
     for data in cookie_files:
         domain = data.get('url', 'unknown')
         cookies = data.get('cookies', [])
@@ -447,191 +673,116 @@ def analyze_cookies(cookie_files):
         stats['cookies_per_domain'][domain] = len(cookies)
         stats['storage_per_domain'][domain] = len(local_storage) + len(session_storage)
         
-        main_domain = '.'.join(urlparse(domain).netloc.split('.')[-2:]) if 'url' in data else 'unknown'
-        
-        # Analyze cookies
-        for cookie in cookies:
-            # Count cookie names
-            name = cookie.get('name', '')
-            stats['common_cookie_names'][name] = stats['common_cookie_names'].get(name, 0) + 1
-            
-            # Count secure and httponly cookies
-            if cookie.get('secure', False):
-                stats['secure_cookies'] += 1
-            if cookie.get('httponly', False):
-                stats['httponly_cookies'] += 1
-            
-            # Count third-party cookies
-            cookie_domain = cookie.get('domain', '')
-            if cookie_domain and not cookie_domain.endswith(main_domain) and not main_domain.endswith(cookie_domain):
-                stats['third_party_cookies'] += 1
-                
-            # Analyze cookie age
-            age_info = cookie.get('age', {})
-            
-            if age_info:
-                # Categorize cookies by session vs persistent
-                if age_info.get('is_session', True):
-                    stats['session_cookies'] += 1
-                    stats['cookie_age_categories']['session'] += 1
-                else:
-                    stats['persistent_cookies'] += 1
-                    
-                    # Get age in days
-                    age_days = age_info.get('days')
-                    
-                    if age_days is not None:
-                        # Categorize by age range
-                        if age_days <= 0:
-                            stats['cookie_age_categories']['expired'] += 1
-                        elif age_days < 1:
-                            stats['cookie_age_categories']['short_term'] += 1
-                        elif age_days <= 30:
-                            stats['cookie_age_categories']['medium_term'] += 1
-                        else:
-                            stats['cookie_age_categories']['long_term'] += 1
-                            
-                        # Round age to nearest day for distribution
-                        rounded_age = max(0, int(age_days))
-                        stats['cookie_age_distribution'][rounded_age] = stats['cookie_age_distribution'].get(rounded_age, 0) + 1
-                        
-            # Analyze SameSite attribute
-            samesite = cookie.get('samesite', '')
-            if not samesite:
-                samesite = 'unspecified'
-            elif samesite.lower() not in ['none', 'lax', 'strict']:
-                samesite = 'unspecified'
-            else:
-                # Capitalize first letter for consistency
-                samesite = samesite.capitalize()
-                
-            # Update global SameSite stats
-            stats['samesite_stats'][samesite] += 1
-            
-            # Update domain-specific SameSite stats
-            if domain not in stats['samesite_by_domain']:
-                stats['samesite_by_domain'][domain] = {
-                    'None': 0,
-                    'Lax': 0,
-                    'Strict': 0,
-                    'unspecified': 0
-                }
-            stats['samesite_by_domain'][domain][samesite] += 1
-        
         # Analyze localStorage and sessionStorage
-        for key in local_storage:
-            stats['common_storage_keys'][f'localStorage:{key}'] = stats['common_storage_keys'].get(f'localStorage:{key}', 0) + 1
-            
-        for key in session_storage:
-            stats['common_storage_keys'][f'sessionStorage:{key}'] = stats['common_storage_keys'].get(f'sessionStorage:{key}', 0) + 1
-    
-    # Sort common cookie names by frequency
-    stats['common_cookie_names'] = dict(sorted(
-        stats['common_cookie_names'].items(), 
-        key=lambda x: x[1], 
-        reverse=True
-    )[:10])
-    
-    # Sort common storage keys by frequency
-    stats['common_storage_keys'] = dict(sorted(
-        stats['common_storage_keys'].items(), 
-        key=lambda x: x[1], 
-        reverse=True
-    )[:10])
-    
-    # Calculate average and maximum cookie age
-    persistent_ages = [age for age, count in stats['cookie_age_distribution'].items() 
-                      for _ in range(count) if age > 0]
+        storage_key_counts.update(f'localStorage:{key}' for key in local_storage)
+        storage_key_counts.update(f'sessionStorage:{key}' for key in session_storage)
     
-    if persistent_ages:
-        stats['avg_cookie_age_days'] = sum(persistent_ages) / len(persistent_ages)
-        stats['max_cookie_age_days'] = max(persistent_ages)
+    # Sort common storage keys by frequency (ties keep first-seen order)
+    stats['common_storage_keys'] = dict(storage_key_counts.most_common(10))
     
-    # Sort age distribution for better display
-    stats['cookie_age_distribution'] = dict(sorted(
-        stats['cookie_age_distribution'].items(), 
-        key=lambda x: x[0]
-    ))
+    # Calculate average and maximum cookie age over whole-day ages above zero
+    positive = rounded_ages > 0
+    if positive.any():
+        stats['avg_cookie_age_days'] = int((rounded_ages * age_counts)[positive].sum()) / int(age_counts[positive].sum())
+        stats['max_cookie_age_days'] = int(rounded_ages[positive].max())
     
     return stats
 
 
+# Column order of the CSV export
+EXPORT_FIELDNAMES = [
+    'type', 'domain', 'timestamp', 'source', 'name', 'value', 'storage_domain',
+    'path', 'expires', 'secure', 'httponly', 'samesite', 'storage_type'
+]
+
+
+def _trunc(value, n=30):
+    """Shorten a value to n characters plus '...' for display in the export"""
+    value = str(value)
+    return value[:n] + '...' if len(value) > n else value
+
+
+def _cookie_export_rows(data):
+    """Yield one export row per cookie in a cookie file, in EXPORT_FIELDNAMES order."""
+    domain = data.get('url', 'unknown')
+    timestamp = data.get('timestamp', datetime.now().isoformat())
+    source = data.get('source', 'unknown')
+    
+    for cookie in data.get('cookies', []):
+        yield (
+            'cookie', domain, timestamp, source,
+            cookie.get('name', ''), _trunc(cookie.get('value', '')), cookie.get('domain', ''),
+            cookie.get('path', ''), cookie.get('expires', ''),
+            cookie.get('secure', False), cookie.get('httponly', False), cookie.get('samesite', ''),
+            'N/A'
+        )
+
+
+def _storage_export_rows(data):
+    """Yield one export row per localStorage/sessionStorage item in a cookie file."""
+    domain = data.get('url', 'unknown')
+    timestamp = data.get('timestamp', datetime.now().isoformat())
+    source = data.get('source', 'unknown')
+    
+    for storage_type, expires in (('localStorage', 'persistent'), ('sessionStorage', 'session')):
+        for key, value in data.get(storage_type, {}).items():
+            yield (
+                'storage', domain, timestamp, source,
+                key, _trunc(value), domain,
+                '/', expires,
+                False, False, '',
+                storage_type
+            )
+
+
 def export_cookies_to_csv(cookie_files, output_file):
     """Export all cookies and storage data to a CSV file for further analysis."""
-    # Create separate dataframes for cookies and storage
-    cookie_rows = []
-    storage_rows = []
+    # Nothing is written, not even a header, when there are no rows
+    if not any(data.get('cookies') or data.get('localStorage') or data.get('sessionStorage')
+               for data in cookie_files):
+        print("No data to export")
+        return
     
-    for data in cookie_files:
-        domain = data.get('url', 'unknown')
-        timestamp = data.get('timestamp', datetime.now().isoformat())
-        source = data.get('source', 'unknown')
+    # Rows are generated per file and go straight to a 1 MiB write buffer;
+    # all cookies first, then all storage items
+    cookie_count = 0
+    storage_count = 0
+    with open(output_file, 'w', buffering=1 << 20, newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(EXPORT_FIELDNAMES)
         
         # Process cookies
-        for cookie in data.get('cookies', []):
-            cookie_rows.append({
-                'type': 'cookie',
-                'domain': domain,
-                'timestamp': timestamp,
-                'source': source,
-                'name': cookie.get('name', ''),
-                'value': cookie.get('value', '')[:30] + '...' if len(cookie.get('value', '')) > 30 else cookie.get('value', ''),
-                'storage_domain': cookie.get('domain', ''),
-                'path': cookie.get('path', ''),
-                'expires': cookie.get('expires', ''),
-                'secure': cookie.get('secure', False),
-                'httponly': cookie.get('httponly', False),
-                'samesite': cookie.get('samesite', ''),
-                'storage_type': 'N/A'
-            })
+        for data in cookie_files:
+            writer.writerows(_cookie_export_rows(data))
+            cookie_count += len(data.get('cookies', []))
         
-        # Process localStorage
-        for key, value in data.get('localStorage', {}).items():
-            storage_rows.append({
-                'type': 'storage',
-                'domain': domain,
-                'timestamp': timestamp,
-                'source': source,
-                'name': key,
-                'value': str(value)[:30] + '...' if len(str(value)) > 30 else str(value),
-                'storage_domain': domain,
-                'path': '/',
-                'expires': 'persistent',
-                'secure': False,
-                'httponly': False,
-                'samesite': '',
-                'storage_type': 'localStorage'
-            })
-        
-        # Process sessionStorage
-        for key, value in data.get('sessionStorage', {}).items():
-            storage_rows.append({
-                'type': 'storage',
-                'domain': domain,
-                'timestamp': timestamp,
-                'source': source,
-                'name': key,
-                'value': str(value)[:30] + '...' if len(str(value)) > 30 else str(value),
-                'storage_domain': domain,
-                'path': '/',
-                'expires': 'session',
-                'secure': False,
-                'httponly': False,
-                'samesite': '',
-                'storage_type': 'sessionStorage'
-            })
-    
-    # Combine all rows
-    all_rows = cookie_rows + storage_rows
-    
-    if all_rows:
-        df = pd.DataFrame(all_rows)
-        df.to_csv(output_file, index=False)
-        print(f"Exported {len(cookie_rows)} cookies and {len(storage_rows)} storage items to {output_file}")
-    else:
-        print("No data to export")
+        # Process localStorage and sessionStorage
+        for data in cookie_files:
+            writer.writerows(_storage_export_rows(data))
+            storage_count += len(data.get('localStorage', {})) + len(data.get('sessionStorage', {}))
+    
+    print(f"Exported {cookie_count} cookies and {storage_count} storage items to {output_file}")
+
+
+# Age ranges for summarizing a wide age distribution: each edge (in days) starts
+# the next range, so the ranges are <1, 1-7, 7-30, 30-90, 90-180, 180-365, >=365
+AGE_RANGE_EDGES = np.array([1, 7, 30, 90, 180, 365])
+AGE_RANGE_LABELS = ["<1 day", "1-7 days", "7-30 days", "1-3 months", "3-6 months", "6-12 months", ">1 year"]
 
 
+def _bucket_ages(ages, counts):
+    """Sum cookie counts by whole-day age into the AGE_RANGE_LABELS ranges."""
+    buckets = np.searchsorted(AGE_RANGE_EDGES, ages, side='right')
+    return np.bincount(buckets, weights=counts, minlength=len(AGE_RANGE_LABELS)).astype(int).tolist()
+
+
+
+def _domain_item_totals(stats):
+    """Cookies plus storage items per domain, as a Counter (zero totals are kept)."""
+    totals = collections.Counter(stats['cookies_per_domain'])
+    totals.update(stats['storage_per_domain'])
+    return totals
+
 def generate_charts(stats, output_dir='charts'):
     """Generate visual charts for cookie statistics."""
     # Create output directory if it doesn't exist
@@ -642,8 +793,38 @@ def generate_charts(stats, output_dir='charts'):
     if stats['total_cookies'] == 0:
         return
     
+    # One figure is reused for every chart: each chart resizes and clears it,
+    # so nothing goes through pyplot's global figure manager. Clearing the whole
+    # figure (not just the axes) drops settings like a pie chart's equal aspect.
+    # Constrained layout fits labels and titles while saving, so no chart needs a
+    # separate tight_layout pass
+    fig = Figure(layout='constrained')
+    FigureCanvasAgg(fig)
+    
+    def start_chart(width, height):
+        fig.clear()
+        fig.set_size_inches(width, height)
+        return fig.subplots()
+    
+    # Each PNG is rendered into memory and written with as few write calls as
+    # possible, instead of savefig streaming it through an 8 KiB file buffer
+    png = io.BytesIO()
+    
+    def save_chart(filename):
+        png.seek(0)
+        png.truncate()
+        fig.savefig(png, format='png')
+        fd = os.open(os.path.join(output_dir, filename), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            with png.getbuffer() as data:
+                written = 0
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+        finally:
+            os.close(fd)
+    
     # 1. Cookie Security Bar Chart
-    plt.figure(figsize=(10, 6))
+    ax = start_chart(10, 6)
     security_data = [
         stats['secure_cookies'],
         stats['httponly_cookies'],
@@ -654,33 +835,31 @@ def generate_charts(stats, output_dir='charts'):
     labels = ['Secure', 'HttpOnly', 'Third-Party', 'Session', 'Persistent']
     colors = ['#4CAF50', '#2196F3', '#FFC107', '#9C27B0', '#F44336']
     
-    bars = plt.bar(labels, security_data, color=colors)
-    plt.title('Cookie Security Analysis', fontsize=16)
-    plt.ylabel('Number of Cookies', fontsize=12)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    bars = ax.bar(labels, security_data, color=colors)
+    ax.set_title('Cookie Security Analysis', fontsize=16)
+    ax.set_ylabel('Number of Cookies', fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Add data labels on top of bars
     for bar in bars:
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'{height}', ha='center', va='bottom')
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+               f'{height}', ha='center', va='bottom')
     
     # Add percentage labels inside bars
     for i, bar in enumerate(bars):
         height = bar.get_height()
         if height > 0:
             percentage = (height / stats['total_cookies']) * 100
-            plt.text(bar.get_x() + bar.get_width()/2., height/2,
-                    f'{percentage:.1f}%', ha='center', va='center', 
-                    color='white', fontweight='bold')
+            ax.text(bar.get_x() + bar.get_width()/2., height/2,
+                   f'{percentage:.1f}%', ha='center', va='center', 
+                   color='white', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'cookie_security.png'))
-    plt.close()
+    save_chart('cookie_security.png')
     
     # 2. Cookie Age Categories Pie Chart
     if stats['persistent_cookies'] > 0:
-        plt.figure(figsize=(10, 8))
+        ax = start_chart(10, 8)
         categories = stats['cookie_age_categories']
         labels = []
         sizes = []
@@ -691,54 +870,43 @@ def generate_charts(stats, output_dir='charts'):
                 sizes.append(count)
         
         # Use a nice color palette
-        colors = plt.cm.Paired(np.linspace(0, 1, len(labels)))
+        colors = matplotlib.colormaps['Paired'](np.linspace(0, 1, len(labels)))
         
         # Create pie chart with a hole in the middle (donut chart)
-        plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', 
-                startangle=90, shadow=True, wedgeprops={'edgecolor': 'w'})
-        plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        plt.title('Cookie Age Distribution', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'cookie_age_pie.png'))
-        plt.close()
+        ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', 
+               startangle=90, wedgeprops={'edgecolor': 'w'})
+        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+        ax.set_title('Cookie Age Distribution', fontsize=16)
+        save_chart('cookie_age_pie.png')
         
         # 3. Cookie Age Distribution Line Chart
         if len(stats['cookie_age_distribution']) > 1:
-            plt.figure(figsize=(12, 6))
+            ax = start_chart(12, 6)
             
             # Group by ranges for better display if we have many different ages
             if len(stats['cookie_age_distribution']) > 10:
                 # Create age ranges
-                ranges = [(0, 1), (1, 7), (7, 30), (30, 90), (90, 180), (180, 365), (365, float('inf'))]
-                range_labels = ["<1 day", "1-7 days", "7-30 days", "1-3 months", "3-6 months", "6-12 months", ">1 year"]
-                range_counts = [0] * len(ranges)
+                range_labels = AGE_RANGE_LABELS
+                range_counts = stats['cookie_age_ranges']
                 
-                for age, count in stats['cookie_age_distribution'].items():
-                    for i, (min_age, max_age) in enumerate(ranges):
-                        if min_age <= age < max_age:
-                            range_counts[i] += count
-                            break
-                
-                plt.bar(range_labels, range_counts, color='#3F51B5', alpha=0.7)
-                plt.plot(range_labels, range_counts, 'o-', color='#E91E63', linewidth=2, markersize=8)
+                ax.bar(range_labels, range_counts, color='#3F51B5', alpha=0.7)
+                ax.plot(range_labels, range_counts, 'o-', color='#E91E63', linewidth=2, markersize=8)
             else:
                 # Use individual days
                 ages = list(stats['cookie_age_distribution'].keys())
                 counts = list(stats['cookie_age_distribution'].values())
                 
-                plt.bar(ages, counts, color='#3F51B5', alpha=0.7)
-                plt.plot(ages, counts, 'o-', color='#E91E63', linewidth=2, markersize=8)
+                ax.bar(ages, counts, color='#3F51B5', alpha=0.7)
+                ax.plot(ages, counts, 'o-', color='#E91E63', linewidth=2, markersize=8)
             
-            plt.title('Cookie Age Distribution', fontsize=16)
-            plt.xlabel('Cookie Age', fontsize=12)
-            plt.ylabel('Number of Cookies', fontsize=12)
-            plt.grid(linestyle='--', alpha=0.7)
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, 'cookie_age_distribution.png'))
-            plt.close()
+            ax.set_title('Cookie Age Distribution', fontsize=16)
+            ax.set_xlabel('Cookie Age', fontsize=12)
+            ax.set_ylabel('Number of Cookies', fontsize=12)
+            ax.grid(linestyle='--', alpha=0.7)
+            save_chart('cookie_age_distribution.png')
     
     # 4. SameSite Statistics Pie Chart
-    plt.figure(figsize=(10, 8))
+    ax = start_chart(10, 8)
     samesite_data = []
     labels = []
     
@@ -748,20 +916,18 @@ def generate_charts(stats, output_dir='charts'):
             labels.append(samesite_type)
     
     # Use a nice color palette
-    colors = plt.cm.tab10(np.linspace(0, 1, len(labels)))
+    colors = matplotlib.colormaps['tab10'](np.linspace(0, 1, len(labels)))
     
     # Create pie chart
-    plt.pie(samesite_data, labels=labels, colors=colors, autopct='%1.1f%%', 
-            startangle=90, shadow=True, wedgeprops={'edgecolor': 'w'})
-    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-    plt.title('SameSite Cookie Distribution', fontsize=16)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'samesite_distribution.png'))
-    plt.close()
+    ax.pie(samesite_data, labels=labels, colors=colors, autopct='%1.1f%%', 
+           startangle=90, wedgeprops={'edgecolor': 'w'})
+    ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    ax.set_title('SameSite Cookie Distribution', fontsize=16)
+    save_chart('samesite_distribution.png')
     
     # 5. SameSite by Domain Stacked Bar Chart (for top domains)
     if stats['samesite_by_domain']:
-        plt.figure(figsize=(14, 10))
+        ax = start_chart(14, 10)
         
         # Get top domains by total cookie count (limit to top 10 for readability)
         top_domains = sorted(stats['samesite_by_domain'].items(), 
@@ -772,40 +938,33 @@ def generate_charts(stats, output_dir='charts'):
         # Shorten domain names if they're too long
         domains = [d[-30:] if len(d) > 30 else d for d in domains]
         
-        # Prepare data for stacked bar chart
-        none_values = [d[1].get('None', 0) for d in top_domains]
-        lax_values = [d[1].get('Lax', 0) for d in top_domains]
-        strict_values = [d[1].get('Strict', 0) for d in top_domains]
-        unspecified_values = [d[1].get('unspecified', 0) for d in top_domains]
+        # Prepare data for stacked bar chart: one row per SameSite value, one column per domain
+        samesite_layers = [('None', 'None', '#FF9800'), ('Lax', 'Lax', '#4CAF50'),
+                           ('Strict', 'Strict', '#2196F3'), ('unspecified', 'Unspecified', '#9E9E9E')]
+        values = np.array([[d[1].get(key, 0) for d in top_domains] for key, _, _ in samesite_layers])
+        
+        # Each layer sits on the running total of the layers below it
+        bottoms = np.vstack([np.zeros(values.shape[1]), np.cumsum(values, axis=0)[:-1]])
         
         # Create stacked bar chart
         bar_width = 0.8
         indices = np.arange(len(domains))
         
-        p1 = plt.bar(indices, none_values, bar_width, label='None', color='#FF9800')
-        p2 = plt.bar(indices, lax_values, bar_width, bottom=none_values, label='Lax', color='#4CAF50')
-        
-        # Add the strict values on top of none and lax
-        bottom_values = [n + l for n, l in zip(none_values, lax_values)]
-        p3 = plt.bar(indices, strict_values, bar_width, bottom=bottom_values, label='Strict', color='#2196F3')
-        
-        # Add the unspecified values on top of the rest
-        bottom_values = [n + l + s for n, l, s in zip(none_values, lax_values, strict_values)]
-        p4 = plt.bar(indices, unspecified_values, bar_width, bottom=bottom_values, label='Unspecified', color='#9E9E9E')
+        for (_, label, color), layer, bottom in zip(samesite_layers, values, bottoms):
+            ax.bar(indices, layer, bar_width, bottom=bottom, label=label, color=color)
         
         # Customize the chart
-        plt.xlabel('Domain', fontsize=14)
-        plt.ylabel('Number of Cookies', fontsize=14)
-        plt.title('SameSite Cookie Settings by Domain (Top 10)', fontsize=16)
-        plt.xticks(indices, domains, rotation=45, ha='right', fontsize=10)
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'samesite_by_domain.png'))
-        plt.close()
+        ax.set_xlabel('Domain', fontsize=14)
+        ax.set_ylabel('Number of Cookies', fontsize=14)
+        ax.set_title('SameSite Cookie Settings by Domain (Top 10)', fontsize=16)
+        ax.set_xticks(indices)
+        ax.set_xticklabels(domains, rotation=45, ha='right', fontsize=10)
+        ax.legend()
+        save_chart('samesite_by_domain.png')
     
     # 6. Top Cookie Names Bar Chart
     if stats['common_cookie_names']:
-        plt.figure(figsize=(12, 8))
+        ax = start_chart(12, 8)
         names = list(stats['common_cookie_names'].keys())
         counts = list(stats['common_cookie_names'].values())
         
@@ -815,60 +974,46 @@ def generate_charts(stats, output_dir='charts'):
         counts = [counts[i] for i in sorted_indices]
         
         # Horizontal bar chart
-        bars = plt.barh(names, counts, color='#009688')
-        plt.title('Top Cookie Names', fontsize=16)
-        plt.xlabel('Count', fontsize=12)
-        plt.grid(axis='x', linestyle='--', alpha=0.7)
+        bars = ax.barh(names, counts, color='#009688')
+        ax.set_title('Top Cookie Names', fontsize=16)
+        ax.set_xlabel('Count', fontsize=12)
+        ax.grid(axis='x', linestyle='--', alpha=0.7)
         
         # Add count labels
         for bar in bars:
             width = bar.get_width()
-            plt.text(width + 0.1, bar.get_y() + bar.get_height()/2,
-                    f'{width}', ha='left', va='center')
+            ax.text(width + 0.1, bar.get_y() + bar.get_height()/2,
+                   f'{width}', ha='left', va='center')
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'top_cookie_names.png'))
-        plt.close()
+        save_chart('top_cookie_names.png')
     
     # 5. Per-Domain Statistics
-    domain_data = []
-    for domain in set(list(stats['cookies_per_domain'].keys()) + list(stats['storage_per_domain'].keys())):
-        cookie_count = stats['cookies_per_domain'].get(domain, 0)
-        storage_count = stats['storage_per_domain'].get(domain, 0)
-        domain_data.append((domain, cookie_count, storage_count))
-    
-    # Sort by total count
-    domain_data.sort(key=lambda x: x[1] + x[2], reverse=True)
-    
-    # Take top 10 domains
-    domain_data = domain_data[:10]
+    # Take the top 10 domains by total count, then look up the split for just those
+    domain_totals = _domain_item_totals(stats)
+    domain_data = [
+        (domain, stats['cookies_per_domain'].get(domain, 0), stats['storage_per_domain'].get(domain, 0))
+        for domain, _ in domain_totals.most_common(10)
+    ]
     
     if domain_data:
-        plt.figure(figsize=(12, 8))
+        ax = start_chart(12, 8)
         domains = [d[0] for d in domain_data]
         cookie_counts = [d[1] for d in domain_data]
         storage_counts = [d[2] for d in domain_data]
         
         # Shorten domain names if they're too long
-        shortened_domains = []
-        for domain in domains:
-            if len(domain) > 30:
-                shortened_domains.append(domain[:27] + '...')
-            else:
-                shortened_domains.append(domain)
+        shortened_domains = [domain[:27] + '...' if len(domain) > 30 else domain for domain in domains]
         
         # Create stacked bar chart
         bar_width = 0.8
-        plt.barh(shortened_domains, cookie_counts, bar_width, label='Cookies', color='#FF5722')
-        plt.barh(shortened_domains, storage_counts, bar_width, left=cookie_counts, label='Storage Items', color='#673AB7')
+        ax.barh(shortened_domains, cookie_counts, bar_width, label='Cookies', color='#FF5722')
+        ax.barh(shortened_domains, storage_counts, bar_width, left=cookie_counts, label='Storage Items', color='#673AB7')
         
-        plt.title('Storage Items per Domain (Top 10)', fontsize=16)
-        plt.xlabel('Number of Items', fontsize=12)
-        plt.legend(loc='best')
-        plt.grid(axis='x', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'domain_statistics.png'))
-        plt.close()
+        ax.set_title('Storage Items per Domain (Top 10)', fontsize=16)
+        ax.set_xlabel('Number of Items', fontsize=12)
+        ax.legend(loc='best')
+        ax.grid(axis='x', linestyle='--', alpha=0.7)
+        save_chart('domain_statistics.png')
     
     print(f"\nCharts have been generated in the '{output_dir}' directory.")
     return output_dir
@@ -946,32 +1091,29 @@ def print_stats(stats):
                 distribution = stats['cookie_age_distribution']
                 max_count = max(distribution.values())
                 scale = min(40, max_count)  # Scale to fit terminal width
+                # Bars are slices of one full-length bar rather than built per row
+                full_bar = '█' * scale
                 
                 # Group by ranges for better display if we have many different ages
                 if len(distribution) > 10:
                     # Create age ranges
-                    ranges = [(0, 1), (1, 7), (7, 30), (30, 90), (90, 180), (180, 365), (365, float('inf'))]
-                    range_labels = ["<1 day", "1-7 days", "7-30 days", "1-3 months", "3-6 months", "6-12 months", ">1 year"]
-                    range_counts = [0] * len(ranges)
-                    
-                    for age, count in distribution.items():
-                        for i, (min_age, max_age) in enumerate(ranges):
-                            if min_age <= age < max_age:
-                                range_counts[i] += count
-                                break
+                    range_labels = AGE_RANGE_LABELS
+                    range_counts = stats['cookie_age_ranges']
+                    # A range can add up to more than the busiest single age, so its bar runs longer
+                    full_bar = '█' * int((max(range_counts) / max_count) * scale)
                     
                     # Print histogram
                     for i, label in enumerate(range_labels):
                         count = range_counts[i]
                         if count > 0:
                             bar_length = int((count / max_count) * scale)
-                            bar = '█' * bar_length
+                            bar = full_bar[:bar_length]
                             print(f"  {label:10s} | {bar} {count}")
                 else:
                     # Print individual days
                     for age, count in sorted(distribution.items()):
                         bar_length = int((count / max_count) * scale)
-                        bar = '█' * bar_length
+                        bar = full_bar[:bar_length]
                         print(f"  {age:10d} | {bar} {count}")
             except Exception as e:
                 # Fall back to simple text
@@ -1000,14 +1142,11 @@ def print_stats(stats):
     
     # Per-domain statistics
     print("\n--- Per-Domain Statistics ---")
-    domain_table = []
-    for domain in set(list(stats['cookies_per_domain'].keys()) + list(stats['storage_per_domain'].keys())):
-        cookie_count = stats['cookies_per_domain'].get(domain, 0)
-        storage_count = stats['storage_per_domain'].get(domain, 0)
-        domain_table.append((domain, cookie_count, storage_count, cookie_count + storage_count))
-    
-    # Sort by total count
-    domain_table.sort(key=lambda x: x[3], reverse=True)
+    # Sorted by total count
+    domain_table = [
+        (domain, stats['cookies_per_domain'].get(domain, 0), stats['storage_per_domain'].get(domain, 0), total)
+        for domain, total in _domain_item_totals(stats).most_common()
+    ]
     
     print(tabulate(domain_table, 
                   headers=["Domain", "Cookies", "Storage Items", "Total Items"], 
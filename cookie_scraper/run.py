@@ -6,9 +6,13 @@ Supports both regular Scrapy and Selenium-enhanced cookie extraction.
 import argparse
 import os
 import sys
+try:
+    import uvloop  # Optional libuv event loop for the asyncio reactor
+except ImportError:
+    uvloop = None
 from scrapy.crawler import CrawlerProcess
 from scrapy.utils.project import get_project_settings
-from spiders.cookie_spider import CookieSpider
+from spiders.cookie_spider import CookieSpider, SetCookieSkippingCachePolicy
 
 
 def main():
@@ -28,6 +32,8 @@ def main():
                         help='Run Selenium in non-headless mode (shows browser UI)')
     parser.add_argument('--wait-time', type=int, default=5, 
                         help='Time to wait (in seconds) for JavaScript execution (default: 5)')
+    parser.add_argument('--pool-size', type=int, default=4,
+                        help='Number of Chrome instances processing URLs concurrently (default: 4)')
     
     args = parser.parse_args()
 
@@ -46,10 +52,23 @@ def main():
         'USER_AGENT': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
         'ROBOTSTXT_OBEY': False,
         'COOKIES_ENABLED': True,
-        'COOKIES_DEBUG': True,
+        'COOKIES_DEBUG': False,
         'DOWNLOAD_TIMEOUT': 60,
+        'CONCURRENT_REQUESTS': 64,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 16,
+        'REACTOR_THREADPOOL_MAXSIZE': 20,
+        # Responses are cached between runs, except ones that set cookies
+        'HTTPCACHE_ENABLED': True,
+        'HTTPCACHE_POLICY': SetCookieSkippingCachePolicy,
+        'HTTPCACHE_STORAGE': 'scrapy.extensions.httpcache.FilesystemCacheStorage',
+        # Selenium work is awaited from coroutine callbacks on the asyncio reactor
+        'TWISTED_REACTOR': 'twisted.internet.asyncioreactor.AsyncioSelectorReactor',
         'SELENIUM_DRIVER_ARGUMENTS': ['--no-sandbox', '--disable-dev-shm-usage']
     })
+    
+    # When uvloop is installed the asyncio reactor runs on its faster libuv loop
+    if uvloop is not None:
+        settings.set('ASYNCIO_EVENT_LOOP', 'uvloop.Loop')
 
     # Create and run crawler process
     process = CrawlerProcess(settings)
@@ -59,6 +78,7 @@ def main():
         'urls': args.urls,
         'headless': not args.no_headless,
         'wait_time': args.wait_time,
+        'pool_size': args.pool_size,
         'no_selenium': args.no_selenium
     }
     
@@ -74,16 +94,21 @@ def main():
     
     # Print summary after completion
     cookies_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cookies')
-    cookie_files = os.listdir(cookies_dir) if os.path.exists(cookies_dir) else []
+    # Count directory entries as they are read instead of building a list of names
+    cookie_file_count = 0
+    if os.path.exists(cookies_dir):
+        with os.scandir(cookies_dir) as entries:
+            cookie_file_count = sum(1 for _ in entries)
     print(f"\nSummary:")
     print(f"Cookies saved to: {cookies_dir}")
-    print(f"Total cookie files: {len(cookie_files)}")
+    print(f"Total cookie files: {cookie_file_count}")
     print(f"Spider results saved to: {args.output}")
     
     # Print Selenium status
     if not args.no_selenium:
         print(f"Selenium mode: {'Headless' if not args.no_headless else 'Visible browser'}")
         print(f"JavaScript wait time: {args.wait_time} seconds")
+        print(f"Browser pool size: {args.pool_size}")
 
 
 if __name__ == "__main__":
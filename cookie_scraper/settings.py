@@ -14,14 +14,29 @@ USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests
-CONCURRENT_REQUESTS = 16
+CONCURRENT_REQUESTS = 64
+CONCURRENT_REQUESTS_PER_DOMAIN = 16
+
+# Threads for blocking work such as DNS resolution
+REACTOR_THREADPOOL_MAXSIZE = 20
 
 # Configure a delay for requests for the same website
 DOWNLOAD_DELAY = 1
 
 # Enable cookies
 COOKIES_ENABLED = True
-COOKIES_DEBUG = True
+# Cookie debugging logs every cookie sent and received; enable only when needed
+COOKIES_DEBUG = False
+
+# Log level
+LOG_LEVEL = 'INFO'
+
+# Cache responses between runs, honouring the sites' own cache headers. Responses
+# that set cookies are never cached: replaying their stored Set-Cookie headers
+# would record stale cookies as freshly observed ones
+HTTPCACHE_ENABLED = True
+HTTPCACHE_POLICY = 'cookie_scraper.cookie_spider.SetCookieSkippingCachePolicy'
+HTTPCACHE_STORAGE = 'scrapy.extensions.httpcache.FilesystemCacheStorage'
 
 # Disable Telnet Console
 TELNETCONSOLE_ENABLED = False
@@ -5,10 +5,25 @@ This demonstrates how to use the cookies collected by the cookie_spider.
 """
 import os
 import json
+try:
+    import orjson  # Faster parsing of the saved cookie files
+except ImportError:
+    orjson = None
 import argparse
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 
+# One session for every request so connections (and their TLS handshakes)
+# are kept alive and reused instead of reopened per call
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_maxsize=32))
+_SESSION.mount('http://', HTTPAdapter(pool_maxsize=32))
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
+})
+
 
 def load_cookies_for_domain(cookies_dir, target_domain):
     """
@@ -23,25 +38,25 @@ def load_cookies_for_domain(cookies_dir, target_domain):
     if target_domain.startswith(('http://', 'https://')):
         target_domain = urlparse(target_domain).netloc
     
-    # Find cookie files for the domain
-    domain_files = []
-    for filename in os.listdir(cookies_dir):
-        if filename.startswith(target_domain.replace('.', '_')) and filename.endswith('.json'):
-            filepath = os.path.join(cookies_dir, filename)
-            domain_files.append((filepath, os.path.getmtime(filepath)))
-    
-    # Sort by modification time (newest first)
-    domain_files.sort(key=lambda x: x[1], reverse=True)
+    # Find cookie files for the domain; scandir entries carry their path and
+    # cache their stat, so each file costs one directory read and one stat
+    prefix = target_domain.replace('.', '_')
+    with os.scandir(cookies_dir) as entries:
+        domain_files = [
+            (entry.path, entry.stat().st_mtime)
+            for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith('.json')
+        ]
     
     if not domain_files:
         print(f"No cookie files found for domain: {target_domain}")
         return None
     
     # Load the most recent cookie file
-    filepath = domain_files[0][0]
+    filepath = max(domain_files, key=lambda x: x[1])[0]
     try:
-        with open(filepath, 'r') as f:
-            cookie_data = json.load(f)
+        with open(filepath, 'rb', buffering=0) as f:
+            cookie_data = orjson.loads(f.read()) if orjson else json.load(f)
         print(f"Loaded cookies from: {filepath}")
         return cookie_data
     except Exception as e:
@@ -63,8 +78,8 @@ def make_request_with_cookies(url, cookie_data):
     # Make the request
     try:
         print(f"Making request to {url} with {len(cookies_dict)} cookies")
-        response = requests.get(url, cookies=cookies_dict, 
-                               headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'})
+        # Streamed so save_response can copy the body to disk in chunks
+        response = _SESSION.get(url, cookies=cookies_dict, stream=True)
         return response
     except Exception as e:
         print(f"Error making request: {e}")
@@ -77,8 +92,11 @@ def save_response(response, output_file):
         return
     
     try:
+        # Copy the body straight from the connection instead of holding it
+        # all in memory; decode_content undoes any gzip/deflate encoding
+        response.raw.decode_content = True
         with open(output_file, 'wb') as f:
-            f.write(response.content)
+            shutil.copyfileobj(response.raw, f, length=1 << 16)
         print(f"Response saved to: {output_file}")
     except Exception as e:
         print(f"Error saving response: {e}")